@@ -1,19 +1,40 @@
 # app.py
+import asyncio
 import csv
+import datetime as _dt
 import hmac
 import hashlib
 import html
 import json
+import logging
 import math
 import os
+import queue
+import random
+import re
+import ssl
+import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from decimal import Decimal
+from functools import lru_cache, wraps
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
-from urllib.parse import quote
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import quote, urlsplit
 
 import httpx
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
 
 
 # ============================================================
@@ -120,6 +141,8 @@ PROMOTION_MAX_PROTECTION_FAILURES = int(os.getenv("PROMOTION_MAX_PROTECTION_FAIL
 PAYLOAD_SCHEMA_VALIDATION_ENABLED = os.getenv("PAYLOAD_SCHEMA_VALIDATION_ENABLED", "true").lower() == "true"
 PAYLOAD_SCHEMA_REQUIRE_VERSION = os.getenv("PAYLOAD_SCHEMA_REQUIRE_VERSION", "false").lower() == "true"
 SUPPORTED_PAYLOAD_VERSIONS = [x.strip() for x in os.getenv("SUPPORTED_PAYLOAD_VERSIONS", "1.0").split(",") if x.strip()]
+PAYLOAD_REQUIRED_FIELDS = ("strategy", "symbol", "side", "orderType", "signalPrice", "sl", "tp1", "tp2", "riskPct", "barTime")
+PAYLOAD_NUMERIC_FIELDS = ("signalPrice", "sl", "tp1", "tp2", "riskPct")
 
 EXECUTION_QUALITY_ENABLED = os.getenv("EXECUTION_QUALITY_ENABLED", "true").lower() == "true"
 MAX_ALLOWED_SLIPPAGE_PCT = float(os.getenv("MAX_ALLOWED_SLIPPAGE_PCT", "0"))
@@ -161,6 +184,77 @@ PAPER_STRATEGY_GUARD_COOLDOWN_HOURS = float(os.getenv("PAPER_STRATEGY_GUARD_COOL
 
 HTTP_TIMEOUT = 15.0
 
+# Outbound HTTP pool settings (shared client for Supabase/Telegram, and the Bybit client).
+# Keep-alive connections are reused across requests; HTTP/2 multiplexes
+# concurrent calls to the same host over one connection.
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SEC = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SEC", "30"))
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+# DEBUG adds full Bybit request/response dumps to the log.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+_LOG_LEVEL_NAMES = {"CRITICAL", "ERROR", "WARNING", "WARN", "INFO", "DEBUG"}
+
+# Worker pool for independent Bybit calls that can run side by side
+# (e.g. TP1, TP2 and SL placement after an entry fill).
+BYBIT_PARALLEL_WORKERS = int(os.getenv("BYBIT_PARALLEL_WORKERS", "8"))
+
+# Bounded pool reserved for /tv alerts so dashboard/cron routes on the shared
+# threadpool cannot starve live webhooks.
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "16"))
+
+# Transport-level retries only cover failed connects, so a POST is never sent twice.
+BYBIT_CONNECT_RETRIES = int(os.getenv("BYBIT_CONNECT_RETRIES", "2"))
+
+# Open the Bybit connection at startup and touch it before the keep-alive expiry,
+# so a sparse alert does not pay a fresh TCP+TLS handshake; 0 disables.
+BYBIT_KEEPWARM_SEC = float(os.getenv("BYBIT_KEEPWARM_SEC", "20"))
+
+# tickSize / qtyStep / minOrderQty change rarely; 0 disables the cache.
+INSTRUMENT_CACHE_TTL_SEC = int(os.getenv("INSTRUMENT_CACHE_TTL_SEC", "3600"))
+# New cache entries reach instrument_cache.json this long after the first unsaved one.
+INSTRUMENT_CACHE_SAVE_DELAY_SEC = float(os.getenv("INSTRUMENT_CACHE_SAVE_DELAY_SEC", "5"))
+# Wallet equity moves slowly next to alert bursts and report loops; 0 disables.
+EQUITY_CACHE_TTL_SEC = float(os.getenv("EQUITY_CACHE_TTL_SEC", "2"))
+# Last price reused within one alert (exposure check, then sizing) and across duplicate alerts.
+TICKER_CACHE_TTL_SEC = float(os.getenv("TICKER_CACHE_TTL_SEC", "1"))
+
+# Post-entry position poll: equal-jitter exponential backoff (base * 2^n, capped),
+# polling until the wall-clock timeout has passed.
+POSITION_POLL_BASE_SEC = float(os.getenv("POSITION_POLL_BASE_SEC", "0.025"))
+POSITION_POLL_CAP_SEC = float(os.getenv("POSITION_POLL_CAP_SEC", "0.5"))
+POSITION_POLL_TIMEOUT_SEC = float(os.getenv("POSITION_POLL_TIMEOUT_SEC", "2.8"))
+# Safety bound only; 0 derives it from timeout / base so the deadline is what ends the poll.
+POSITION_POLL_MAX_ATTEMPTS = int(os.getenv("POSITION_POLL_MAX_ATTEMPTS", "0")) or (
+    math.ceil(POSITION_POLL_TIMEOUT_SEC / max(POSITION_POLL_BASE_SEC, 0.001)) + 1
+)
+
+# TP1 + TP2 go out as one /v5/order/create-batch call; falls back to single orders.
+TP_BATCH_ENABLED = os.getenv("TP_BATCH_ENABLED", "true").lower() == "true"
+
+# SL rides on the entry order itself (not on flips); trading-stop stays as the fallback.
+ENTRY_ATTACH_SL_ENABLED = os.getenv("ENTRY_ATTACH_SL_ENABLED", "true").lower() == "true"
+
+# Entry rejections that blame the attached SL; only these are resent without it.
+_ENTRY_SL_REJECT_CODES = {10001, 110061}
+_ENTRY_SL_REJECT_HINTS = ("stoploss", "stop loss", "stop_loss", "tp/sl", "tpsl", "sl price")
+
+# Private websocket position stream; the post-entry wait uses it first and falls
+# back to the REST poll above when the stream is down or silent.
+BYBIT_PRIVATE_WS_ENABLED = os.getenv("BYBIT_PRIVATE_WS_ENABLED", "true").lower() == "true"
+BYBIT_PRIVATE_WS_URL = os.getenv(
+    "BYBIT_PRIVATE_WS_URL",
+    "wss://stream-testnet.bybit.com/v5/private" if "testnet" in BYBIT_BASE else "wss://stream.bybit.com/v5/private",
+)
+POSITION_WS_WAIT_SEC = float(os.getenv("POSITION_WS_WAIT_SEC", "1.5"))
+# No update at all for the position within this window: treat the stream as silent and poll.
+POSITION_WS_FIRST_MSG_SEC = float(os.getenv("POSITION_WS_FIRST_MSG_SEC", "0.4"))
+
+# Drawdown guard equity is refreshed in the background; 0 = fetch on every check.
+GUARD_EQUITY_REFRESH_SEC = float(os.getenv("GUARD_EQUITY_REFRESH_SEC", "5"))
+
 APP_DIR = Path(__file__).resolve().parent
 PAPER_MONITOR_STATE_FILE = APP_DIR / "paper_monitor_state.json"
 PAPER_STRATEGY_GUARD_STATE_FILE = APP_DIR / "paper_strategy_guard_state.json"
@@ -169,9 +263,108 @@ TRADE_LOG_FILE = APP_DIR / "trade_log.csv"
 RUNTIME_STATE_FILE = APP_DIR / "runtime_state.json"
 BACKTEST_FILE = APP_DIR / "backtest_results.json"
 DAILY_REPORT_STATE_FILE = APP_DIR / "daily_report_state.json"
+INSTRUMENT_CACHE_FILE = APP_DIR / "instrument_cache.json"
+
+app = FastAPI(
+    title="TradingView Bybit Risk Engine",
+    version="9.4.10",
+    default_response_class=ORJSONResponse,
+)
+# Dashboards/reports can run to hundreds of KB; /tv replies stay under the threshold.
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+client = httpx.Client(
+    timeout=HTTP_TIMEOUT,
+    http2=HTTP2_ENABLED,
+    limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SEC,
+    ),
+)
+
+# Dedicated keep-alive pool for the Bybit API; the auth headers that never
+# change are set once on bybit_client so bybit() only adds timestamp + signature.
+_bybit_transport = httpx.HTTPTransport(
+    http2=HTTP2_ENABLED,
+    retries=max(0, BYBIT_CONNECT_RETRIES),
+    limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SEC,
+    ),
+)
+bybit_client = httpx.Client(
+    base_url=BYBIT_BASE,
+    timeout=HTTP_TIMEOUT,
+    headers={
+        "X-BAPI-API-KEY": API_KEY,
+        "X-BAPI-RECV-WINDOW": RECV_WINDOW,
+        "Content-Type": "application/json",
+    },
+    transport=_bybit_transport,
+)
+# Public market data: same connection pool, but no API key on the wire.
+bybit_public_client = httpx.Client(base_url=BYBIT_BASE, timeout=HTTP_TIMEOUT, transport=_bybit_transport)
+
+bybit_pool = ThreadPoolExecutor(max_workers=max(1, BYBIT_PARALLEL_WORKERS), thread_name_prefix="bybit")
+webhook_pool = ThreadPoolExecutor(max_workers=max(1, WEBHOOK_WORKERS), thread_name_prefix="webhook")
+
+
+@app.on_event("shutdown")
+def close_http_client() -> None:
+    # Stop the background loops first so none of them picks up a closed client.
+    for task in (_bybit_keepwarm_task, _guard_refresh_task, _ws_task):
+        if task is not None:
+            task.cancel()
+    webhook_pool.shutdown(wait=False)
+    bybit_pool.shutdown(wait=False)
+    bybit_public_client.close()
+    bybit_client.close()
+    client.close()
+    if _instrument_save_timer is not None:
+        _instrument_save_timer.cancel()
+        flush_instrument_cache_save()
+    _log_listener.stop()
+
+
+def bybit_touch_connection() -> None:
+    try:
+        # Shared transport: this keeps the signed pool warm without sending the API key.
+        bybit_public_client.get("/v5/market/time")
+    except Exception as exc:
+        log(f"[WARN] Bybit keep-warm request failed: {exc}")
 
-app = FastAPI(title="TradingView Bybit Risk Engine", version="9.4.10")
-client = httpx.Client(timeout=HTTP_TIMEOUT)
+
+async def bybit_keepwarm_loop() -> None:
+    while True:
+        await run_in_threadpool(bybit_touch_connection)
+        await asyncio.sleep(BYBIT_KEEPWARM_SEC)
+
+
+_bybit_keepwarm_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_bybit_keepwarm() -> None:
+    global _bybit_keepwarm_task
+    if BYBIT_KEEPWARM_SEC > 0:
+        _bybit_keepwarm_task = asyncio.create_task(bybit_keepwarm_loop())
+
+
+async def json_body(request: Request) -> Any:
+    # Reads the JSON body on the event loop; handlers that take it via Depends can then
+    # be plain `def` and run in the threadpool, so their Bybit/Supabase/Telegram calls
+    # never block other requests (notably /tv).
+    try:
+        return orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(400, "Invalid JSON")
+
+
+@app.exception_handler(HTTPException)
+async def http_exception_handler(request: Request, exc: HTTPException) -> ORJSONResponse:
+    # Same {"detail": ...} body as FastAPI's default handler, encoded with orjson.
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=getattr(exc, "headers", None))
 
 
 # ============================================================
@@ -184,11 +377,14 @@ _guard = {
     "limit_usd": None,
     "baseline": None,
     "equity_now": None,
+    "equity_updated_at": None,
     "drawdown_usd": 0.0,
     "drawdown_pct": 0.0,
     "block": False,
     "start_date": None,
 }
+# Alerts run on several worker threads; state updates and snapshots go through this lock.
+_guard_lock = threading.Lock()
 
 
 # ============================================================
@@ -196,11 +392,21 @@ _guard = {
 # ============================================================
 
 def now_ms() -> str:
-    return str(int(time.time() * 1000))
+    return str(time.time_ns() // 1_000_000)
+
+
+_now_iso_cache: Tuple[int, str] = (0, "")
 
 
 def now_iso() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    # Second resolution, so strftime only runs when the second changes; the tuple swap is atomic.
+    global _now_iso_cache
+    sec = int(time.time())
+    cached_sec, text = _now_iso_cache
+    if sec != cached_sec:
+        text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _now_iso_cache = (sec, text)
+    return text
 
 
 def iso_utc_seconds_ago(seconds: int) -> str:
@@ -208,36 +414,142 @@ def iso_utc_seconds_ago(seconds: int) -> str:
 
 
 def hmac_sha256(key: str, value: str) -> str:
-    return hmac.new(key.encode(), value.encode(), hashlib.sha256).hexdigest()
+    return hmac.digest(key.encode(), value.encode(), "sha256").hex()
+
+
+# Keyed once at import; copy() reuses the prepared inner/outer pad state per sign.
+# The "sha256" name (not the hashlib constructor) keeps HMAC on OpenSSL's EVP path,
+# which uses SHA-NI where the CPU supports it.
+_BYBIT_HMAC = hmac.new(API_SECRET.encode(), digestmod="sha256")
+_BYBIT_KEY_WINDOW = (API_KEY + RECV_WINDOW).encode()
+_SHARED_SECRET_BYTES = SHARED_SECRET.encode()
+_CRON_SECRET_BYTES = (CRON_SECRET or SHARED_SECRET).encode()
+HMAC_OPENSSL_BACKED = getattr(hashlib.sha256, "__module__", "") == "_hashlib"
 
 
-def sign_v5(ts: str, api_key: str, recv_window: str, payload: str) -> str:
-    return hmac_sha256(API_SECRET, ts + api_key + recv_window + payload)
+@app.on_event("startup")
+def log_signing_backend() -> None:
+    # SHA-NI dispatch needs OpenSSL >= 1.1.1; the version line tells which build the image carries.
+    backend = "OpenSSL" if HMAC_OPENSSL_BACKED else "builtin"
+    log(f"[INFO] HMAC-{hashlib.sha256().name.upper()} via {backend}: {ssl.OPENSSL_VERSION}")
+    if not HMAC_OPENSSL_BACKED:
+        log("[WARN] hashlib sha256 is not OpenSSL-backed; Bybit signing uses the slow fallback")
+
+
+def sign_v5(ts: str, api_key: str, recv_window: str, payload: Union[str, bytes]) -> str:
+    mac = _BYBIT_HMAC.copy()
+    mac.update(ts.encode())
+    if api_key == API_KEY and recv_window == RECV_WINDOW:
+        mac.update(_BYBIT_KEY_WINDOW)
+    else:
+        mac.update((api_key + recv_window).encode())
+    mac.update(payload if isinstance(payload, (bytes, bytearray)) else payload.encode())
+    return mac.hexdigest()
+
+
+def secret_matches(value: Any) -> bool:
+    if value is None or not SHARED_SECRET:
+        return False
+    return hmac.compare_digest(str(value).encode(), _SHARED_SECRET_BYTES)
 
 
 def round_step(value: float, step: float) -> float:
     if step <= 0:
         return value
-    return math.floor(value / step) * step
+    # The epsilon absorbs float noise (0.3 / 0.1 == 2.9999999999999996), and rounding
+    # to the step's decimals returns the exact tick value rather than n * step noise.
+    ticks = math.floor(value / step + 1e-9)
+    return round(ticks * step, step_scale(step))
+
+
+@lru_cache(maxsize=1024)
+def step_scale(step: float) -> int:
+    # decimals implied by an instrument tick/lot step, e.g. 0.001 -> 3, 5 -> 0
+    if step <= 0:
+        return 8
+    return min(8, max(0, -Decimal(str(step)).normalize().as_tuple().exponent))
 
 
-def fmt_qty(qty: float) -> str:
+def fmt_qty(qty: float, step: float = 0.0) -> str:
+    if step > 0:
+        return f"{qty:.{step_scale(step)}f}"
     text = f"{qty:.8f}"
     return text.rstrip("0").rstrip(".") if "." in text else text
 
 
 def fmt_price(price: float, tick: float) -> str:
     rounded = round_step(price, tick)
+    if tick > 0:
+        return f"{rounded:.{step_scale(tick)}f}"
     text = f"{rounded:.8f}"
     return text.rstrip("0").rstrip(".") if "." in text else text
 
 
-def ok(data: Dict[str, Any]) -> JSONResponse:
-    return JSONResponse({"ok": True, **data})
+def ok(data: Dict[str, Any]) -> ORJSONResponse:
+    return ORJSONResponse({"ok": True, **data})
+
+
+def json_bytes(data: Any) -> bytes:
+    # orjson for outbound request bodies; non-str keys are stringified like json.dumps does.
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def load_json_bytes(raw: bytes) -> Any:
+    # State files are written by json.dump, which allows NaN/Infinity; orjson rejects those.
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
+_PONG_BODY = orjson.dumps({"ok": True, "msg": "pong"})
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Log lines are handed to a queue and written to stdout by a listener thread,
+# so request handlers never wait on the stdout lock or a flush.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+
+logger = logging.getLogger("tv")
+logger.setLevel(LOG_LEVEL if LOG_LEVEL in _LOG_LEVEL_NAMES else "INFO")
+logger.propagate = False
+logger.addHandler(QueueHandler(_log_queue))
+if LOG_LEVEL not in _LOG_LEVEL_NAMES:
+    logger.warning(f"[WARN] Unknown LOG_LEVEL={LOG_LEVEL!r}; using INFO")
 
 
 def log(msg: str) -> None:
-    print(msg, flush=True)
+    logger.info(msg)
+
+
+def log_debug(msg: str, *args: Any) -> None:
+    # %-style args so hot paths skip the formatting when DEBUG is off.
+    logger.debug(msg, *args)
+
+
+_ORDER_SUMMARY_KEYS = ("symbol", "side", "qty", "price", "triggerPrice", "stopLoss", "orderLinkId")
+
+
+def order_summary(req: Dict[str, Any]) -> str:
+    return " ".join(f"{key}={req[key]}" for key in _ORDER_SUMMARY_KEYS if req.get(key) not in (None, ""))
+
+
+def log_exchange(tag: str, payload: Any) -> None:
+    # Full Bybit request/response dumps only at DEBUG; INFO keeps a one-line
+    # audit summary of each order request and the outcome of each call.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{tag}: {payload}")
+    elif not isinstance(payload, dict):
+        return
+    elif tag.startswith("[RESP]"):
+        logger.info(f"{tag}: retCode={payload.get('retCode')} retMsg={payload.get('retMsg')}")
+    elif tag.startswith("[REQ]"):
+        items = payload.get("request") if isinstance(payload.get("request"), list) else [payload]
+        logger.info(f"{tag}: " + " | ".join(order_summary(item) for item in items))
 
 
 def normalize_symbol(symbol: str) -> str:
@@ -314,8 +626,7 @@ def load_runtime_state() -> Dict[str, Any]:
         return state
 
     try:
-        with RUNTIME_STATE_FILE.open("r", encoding="utf-8") as file:
-            state = json.load(file)
+        state = load_json_bytes(RUNTIME_STATE_FILE.read_bytes())
     except Exception:
         state = default_runtime_state()
         save_runtime_state(state)
@@ -359,8 +670,7 @@ def set_trading_paused(paused: bool, reason: Optional[str] = None) -> Dict[str,
 def load_state() -> Dict[str, Any]:
     if not STATE_FILE.exists():
         raise HTTPException(500, f"Missing strategy_state.json at {STATE_FILE}")
-    with STATE_FILE.open("r", encoding="utf-8") as file:
-        return json.load(file)
+    return load_json_bytes(STATE_FILE.read_bytes())
 
 
 def save_state(state: Dict[str, Any]) -> None:
@@ -501,7 +811,9 @@ def supabase_enabled() -> bool:
     return bool(SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY and SUPABASE_TABLE)
 
 
+@lru_cache(maxsize=None)
 def supabase_headers(prefer: str = "return=minimal") -> Dict[str, str]:
+    # Built once per Prefer value; callers pass it straight to httpx and must not mutate it.
     headers = {
         "apikey": SUPABASE_SERVICE_ROLE_KEY,
         "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
@@ -557,7 +869,7 @@ def write_supabase_trade_event(
         resp = client.post(
             supabase_table_url(),
             headers=supabase_headers(),
-            json=payload,
+            content=json_bytes(payload),
         )
         if resp.status_code >= 400:
             log(f"[WARN] Supabase insert failed: {resp.status_code} {resp.text}")
@@ -596,7 +908,7 @@ def write_trade_log(
         decision_reason,
         order_id,
         status,
-        json.dumps(sanitize_payload(body), ensure_ascii=False),
+        json_bytes(sanitize_payload(body)).decode(),
     ]
 
     with TRADE_LOG_FILE.open("a", newline="", encoding="utf-8") as file:
@@ -750,7 +1062,6 @@ def _local_trade_log_rows_for_reporting(limit: int = 100, days: Optional[int] =
                 filtered.append(row)
                 continue
             try:
-                import datetime as _dt
                 cleaned = str(raw_ts).replace("Z", "+00:00")
                 parsed = _dt.datetime.fromisoformat(cleaned)
                 if parsed.tzinfo is None:
@@ -789,7 +1100,7 @@ def fetch_supabase_logs(limit: int = 100) -> list[Dict[str, Any]]:
             _trade_log_cloud_fail("fetch_recent", f"HTTP_{resp.status_code} {resp.text[:240]}")
             return _local_trade_log_rows_for_reporting(limit=safe_limit)
 
-        rows = resp.json()
+        rows = orjson.loads(resp.content)
         if not isinstance(rows, list):
             _trade_log_cloud_fail("fetch_recent", "INVALID_JSON_RESPONSE_NOT_LIST")
             return _local_trade_log_rows_for_reporting(limit=safe_limit)
@@ -829,7 +1140,7 @@ def fetch_supabase_logs_since(days: int = 1, limit: int = 5000) -> list[Dict[str
             _trade_log_cloud_fail("fetch_since", f"HTTP_{resp.status_code} {resp.text[:240]}")
             return _local_trade_log_rows_for_reporting(limit=safe_limit, days=safe_days)
 
-        rows = resp.json()
+        rows = orjson.loads(resp.content)
         if not isinstance(rows, list):
             _trade_log_cloud_fail("fetch_since", "INVALID_JSON_RESPONSE_NOT_LIST")
             return _local_trade_log_rows_for_reporting(limit=safe_limit, days=safe_days)
@@ -873,7 +1184,7 @@ def fetch_recent_duplicate_candidate(
         log(f"[WARN] Supabase duplicate fetch failed: {resp.status_code} {resp.text}")
         return None
 
-    rows = resp.json()
+    rows = orjson.loads(resp.content)
     if not rows:
         return None
 
@@ -912,7 +1223,7 @@ def fetch_recent_alert_idempotency_candidates(
         log(f"[WARN] Supabase idempotency fetch failed: {resp.status_code} {resp.text}")
         return []
 
-    rows = resp.json()
+    rows = orjson.loads(resp.content)
     if not isinstance(rows, list):
         return []
 
@@ -2247,49 +2558,97 @@ def get_strategy_side_config(
 # BYBIT CORE CALL
 # ============================================================
 
-def bybit(method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    url = BYBIT_BASE + path
+# Headers of the last Bybit response on this thread; the retry layer reads the
+# rate-limit reset time from them.
+_bybit_last = threading.local()
+
+
+def bybit(method: str, path: str, params: Union[Dict[str, Any], str, None] = None) -> Dict[str, Any]:
+    url = path
     ts = now_ms()
 
     if method.upper() == "GET":
         query = ""
-        if params:
+        if isinstance(params, str):
+            # Prebuilt, already-sorted query string from a hot-path reader.
+            query = params
+            url = url + "?" + query
+        elif params:
             items = sorted((key, str(value)) for key, value in params.items() if value is not None)
             query = "&".join([f"{key}={value}" for key, value in items])
             url = url + "?" + query
 
         sign = sign_v5(ts, API_KEY, RECV_WINDOW, query)
         headers = {
-            "X-BAPI-API-KEY": API_KEY,
             "X-BAPI-TIMESTAMP": ts,
-            "X-BAPI-RECV-WINDOW": RECV_WINDOW,
             "X-BAPI-SIGN": sign,
         }
-        response = client.get(url, headers=headers)
+        response = bybit_client.get(url, headers=headers)
 
     else:
-        body = json.dumps(params or {}, separators=(",", ":"))
+        body = orjson.dumps(params or {})
         sign = sign_v5(ts, API_KEY, RECV_WINDOW, body)
         headers = {
-            "X-BAPI-API-KEY": API_KEY,
             "X-BAPI-TIMESTAMP": ts,
-            "X-BAPI-RECV-WINDOW": RECV_WINDOW,
             "X-BAPI-SIGN": sign,
-            "Content-Type": "application/json",
         }
-        response = client.post(url, headers=headers, content=body)
+        response = bybit_client.post(url, headers=headers, content=body)
+
+    _bybit_last.headers = response.headers
 
     if response.status_code >= 400:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
-    return response.json()
+    return orjson.loads(response.content)
 
 
 # ============================================================
 # BYBIT HELPERS
 # ============================================================
 
+_inflight: Dict[Tuple[Any, ...], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def single_flight(fn):
+    # Concurrent identical reads (e.g. several alerts for one symbol) share one Bybit round trip.
+    @wraps(fn)
+    def wrapper(*args):
+        key = (fn.__name__, *args)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                _inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+    return wrapper
+
+
+_instrument_cache: Dict[str, Tuple[float, Tuple[float, float, float]]] = {}
+
+
+@single_flight
 def get_instrument(symbol: str) -> Tuple[float, float, float]:
+    cached = _instrument_cache.get(symbol)
+    if cached and cached[0] > time.time():
+        return cached[1]
+
     resp = bybit(
         "GET",
         "/v5/market/instruments-info",
@@ -2303,7 +2662,10 @@ def get_instrument(symbol: str) -> Tuple[float, float, float]:
     if not instruments:
         raise HTTPException(400, f"Symbol not found: {symbol}")
 
-    item = instruments[0]
+    return cache_instrument(symbol, instruments[0])
+
+
+def cache_instrument(symbol: str, item: Dict[str, Any]) -> Tuple[float, float, float]:
     price_filter = item.get("priceFilter", {})
     lot_filter = item.get("lotSizeFilter", {})
 
@@ -2311,27 +2673,141 @@ def get_instrument(symbol: str) -> Tuple[float, float, float]:
     step = float(lot_filter.get("qtyStep", "0.001"))
     min_qty = float(lot_filter.get("minOrderQty", "0.001"))
 
-    return tick, step, min_qty
+    spec = (tick, step, min_qty)
+    if INSTRUMENT_CACHE_TTL_SEC > 0:
+        _instrument_cache[symbol] = (time.time() + INSTRUMENT_CACHE_TTL_SEC, spec)
+        schedule_instrument_cache_save()
+
+    return spec
+
+
+_instrument_save_lock = threading.Lock()
+_instrument_save_timer: Optional[threading.Timer] = None
+
+
+def schedule_instrument_cache_save() -> None:
+    # Debounced: a burst of misses (or a scanner seeding hundreds of symbols) ends in one write.
+    global _instrument_save_timer
+    with _instrument_save_lock:
+        if _instrument_save_timer is not None:
+            return
+        _instrument_save_timer = threading.Timer(INSTRUMENT_CACHE_SAVE_DELAY_SEC, flush_instrument_cache_save)
+        _instrument_save_timer.daemon = True
+        _instrument_save_timer.start()
+
+
+def flush_instrument_cache_save() -> None:
+    global _instrument_save_timer
+    with _instrument_save_lock:
+        _instrument_save_timer = None
+    save_instrument_cache_file()
+
+
+def load_instrument_cache_file() -> int:
+    # Entries keep their absolute expiry, so a restart within the TTL reuses them as-is.
+    now = time.time()
+    loaded = 0
+    for symbol, entry in (read_json_file(INSTRUMENT_CACHE_FILE, {}) or {}).items():
+        try:
+            expires_at, tick, step, min_qty = (float(x) for x in entry)
+        except (TypeError, ValueError):
+            continue
+        if expires_at > now:
+            _instrument_cache.setdefault(symbol, (expires_at, (tick, step, min_qty)))
+            loaded += 1
+    return loaded
+
 
+_instrument_file_lock = threading.Lock()
 
+
+def save_instrument_cache_file() -> None:
+    data = {symbol: [expires_at, *spec] for symbol, (expires_at, spec) in list(_instrument_cache.items())}
+    tmp = INSTRUMENT_CACHE_FILE.with_suffix(".tmp")
+    try:
+        with _instrument_file_lock:
+            tmp.write_bytes(orjson.dumps(data))
+            os.replace(tmp, INSTRUMENT_CACHE_FILE)
+    except Exception as exc:
+        log(f"[WARN] instrument cache save failed: {exc}")
+
+
+def prewarm_instrument_cache() -> None:
+    try:
+        strategies = load_state().get("strategies") or {}
+    except Exception as e:
+        log(f"[WARN] instrument prewarm skipped: {e}")
+        return
+
+    symbols = {
+        normalize_symbol(symbol)
+        for strategy in strategies.values()
+        if isinstance(strategy, dict)
+        for symbol in (strategy.get("symbols") or {})
+    }
+
+    missing = sorted(symbol for symbol in symbols if symbol not in _instrument_cache)
+    for symbol in missing:
+        try:
+            get_instrument(symbol)
+        except Exception as e:
+            log(f"[WARN] instrument prewarm {symbol} failed: {e}")
+
+    log(f"[INFO] instrument cache prewarmed for {len(symbols)} symbols ({len(missing)} fetched)")
+
+
+@app.on_event("startup")
+def start_instrument_prewarm() -> None:
+    # Off the startup path so the port binds immediately; the first alert per
+    # configured symbol then skips the instruments-info round trip.
+    if INSTRUMENT_CACHE_TTL_SEC > 0:
+        log(f"[INFO] instrument cache loaded {load_instrument_cache_file()} symbols from disk")
+        bybit_pool.submit(prewarm_instrument_cache)
+
+
+@lru_cache(maxsize=512)
+def linear_symbol_query(symbol: str) -> str:
+    # Signed query for category+symbol reads, in the sorted order bybit() signs.
+    return f"category=linear&symbol={symbol}"
+
+
+_ticker_cache: Dict[str, Tuple[float, float]] = {}
+
+
+@single_flight
 def get_ticker_last(symbol: str) -> float:
-    resp = bybit(
-        "GET",
-        "/v5/market/tickers",
-        {
-            "category": "linear",
-            "symbol": symbol,
-        },
-    )
+    cached = _ticker_cache.get(symbol)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    resp = bybit("GET", "/v5/market/tickers", linear_symbol_query(symbol))
 
     items = (resp.get("result") or {}).get("list") or []
     if not items:
         raise HTTPException(400, f"No ticker for {symbol}")
 
-    return float(items[0]["lastPrice"])
+    last = float(items[0]["lastPrice"])
+    if TICKER_CACHE_TTL_SEC > 0:
+        _ticker_cache[symbol] = (time.monotonic() + TICKER_CACHE_TTL_SEC, last)
+    return last
+
 
+_equity_cache: Dict[str, float] = {"value": 0.0, "expires_at": 0.0}
 
+
+@single_flight
 def get_equity_usdt() -> float:
+    if _equity_cache["expires_at"] > time.monotonic():
+        return _equity_cache["value"]
+
+    equity = fetch_equity_usdt()
+    if EQUITY_CACHE_TTL_SEC > 0:
+        _equity_cache["value"] = equity
+        _equity_cache["expires_at"] = time.monotonic() + EQUITY_CACHE_TTL_SEC
+    return equity
+
+
+def fetch_equity_usdt() -> float:
     resp = bybit(
         "GET",
         "/v5/account/wallet-balance",
@@ -2345,23 +2821,17 @@ def get_equity_usdt() -> float:
     if not accounts:
         return 0.0
 
-    coins = accounts[0].get("coin", [])
-    for coin in coins:
-        if coin.get("coin") == "USDT":
-            return float(coin.get("equity", "0") or 0)
+    coins = {coin.get("coin"): coin for coin in accounts[0].get("coin") or []}
+    usdt = coins.get("USDT")
+    if not usdt:
+        return 0.0
 
-    return 0.0
+    return float(usdt.get("equity", "0") or 0)
 
 
+@single_flight
 def get_position_linear(symbol: str) -> Dict[str, Any]:
-    resp = bybit(
-        "GET",
-        "/v5/position/list",
-        {
-            "category": "linear",
-            "symbol": symbol,
-        },
-    )
+    resp = bybit("GET", "/v5/position/list", linear_symbol_query(symbol))
 
     positions = (resp.get("result") or {}).get("list") or []
     if not positions:
@@ -2436,9 +2906,9 @@ def set_leverage(symbol: str, leverage: int) -> Dict[str, Any]:
         "buyLeverage": str(leverage),
         "sellLeverage": str(leverage),
     }
-    log(f"[REQ] set-leverage: {req}")
+    log_exchange("[REQ] set-leverage", req)
     resp = bybit("POST", "/v5/position/set-leverage", req)
-    log(f"[RESP] set-leverage: {resp}")
+    log_exchange("[RESP] set-leverage", resp)
     return resp
 
 
@@ -2906,13 +3376,15 @@ def validate_post_order_protection(symbol: str) -> Dict[str, Any]:
     last_details: Dict[str, Any] = {}
 
     for attempt in range(1, attempts + 1):
-        position = get_position_linear(symbol)
+        # Position and open orders are independent reads; fetch them side by side.
+        position_job = bybit_pool.submit(get_position_linear, symbol)
+        open_orders = get_open_orders(symbol)
+        position = position_job.result()
         size = abs(float(position.get("size", "0") or 0.0))
         side = position.get("side") or ""
         stop_loss = position.get("stopLoss", "")
         take_profit = position.get("takeProfit", "")
 
-        open_orders = get_open_orders(symbol)
         active_orders = [
             order for order in open_orders
             if str(order.get("orderStatus", "")).lower() in {"new", "partiallyfilled", "untriggered"}
@@ -3000,7 +3472,7 @@ def notify_event(title: str, message: str, important: bool = False) -> Dict[str,
     }
 
     try:
-        resp = client.post(url, json=payload, timeout=10.0)
+        resp = client.post(url, content=json_bytes(payload), headers=_JSON_HEADERS, timeout=10.0)
         if resp.status_code >= 400:
             log(f"[WARN] Telegram notify failed: {resp.status_code} {resp.text}")
             return {"ok": False, "sent": False, "reason": resp.text}
@@ -3099,8 +3571,7 @@ def format_daily_report_message(days: int = 1) -> str:
 
 
 def verify_cron_secret(secret: str) -> None:
-    expected = CRON_SECRET or SHARED_SECRET
-    if secret != expected:
+    if not _CRON_SECRET_BYTES or not hmac.compare_digest(str(secret).encode(), _CRON_SECRET_BYTES):
         raise HTTPException(401, "Unauthorized")
 
 
@@ -3776,10 +4247,12 @@ def risk_engine_decision(body: Dict[str, Any]) -> Dict[str, Any]:
 # ============================================================
 
 def verify_secret(request: Request, body: Dict[str, Any]) -> None:
-    header_secret = request.headers.get("x-alert-secret") or request.headers.get("X-Alert-Secret")
-    body_secret = body.get("secret")
+    # TradingView alerts carry the secret in the body, so check it before touching headers.
+    if isinstance(body, dict) and secret_matches(body.get("secret")):
+        return
 
-    if SHARED_SECRET and (header_secret == SHARED_SECRET or body_secret == SHARED_SECRET):
+    # Starlette headers are case-insensitive, so one lookup covers X-Alert-Secret too.
+    if secret_matches(request.headers.get("x-alert-secret")):
         return
 
     raise HTTPException(401, "Unauthorized")
@@ -3789,32 +4262,72 @@ def verify_secret(request: Request, body: Dict[str, Any]) -> None:
 # DRAWDOWN GUARD
 # ============================================================
 
+def guard_store_equity(equity: float) -> None:
+    with _guard_lock:
+        _guard["equity_now"] = equity
+        _guard["equity_updated_at"] = time.time()
+
+
+def guard_cached_equity() -> Optional[float]:
+    updated_at = _guard.get("equity_updated_at")
+    if GUARD_EQUITY_REFRESH_SEC <= 0 or updated_at is None:
+        return None
+    # Fall back to a live read if the background refresher has stalled.
+    if time.time() - updated_at > GUARD_EQUITY_REFRESH_SEC * 3:
+        return None
+    return _guard.get("equity_now")
+
+
+async def guard_equity_refresher() -> None:
+    while True:
+        if _guard["enabled"]:
+            try:
+                guard_store_equity(await run_in_threadpool(fetch_equity_usdt))
+            except Exception as exc:
+                log(f"[WARN] guard equity refresh failed: {exc}")
+        await asyncio.sleep(GUARD_EQUITY_REFRESH_SEC)
+
+
+_guard_refresh_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_guard_equity_refresher() -> None:
+    global _guard_refresh_task
+    if GUARD_EQUITY_REFRESH_SEC > 0:
+        _guard_refresh_task = asyncio.create_task(guard_equity_refresher())
+
+
 def guard_check_block() -> bool:
     if not _guard["enabled"]:
         return False
 
-    if _guard["baseline"] is None:
-        _guard["baseline"] = get_equity_usdt()
-        _guard["start_date"] = int(time.time())
+    equity = guard_cached_equity()
+    if equity is None:
+        equity = get_equity_usdt()
+        guard_store_equity(equity)
 
-    equity = get_equity_usdt()
-    _guard["equity_now"] = equity
+    # The equity read stays outside the lock; it is single-flighted and cached already.
+    with _guard_lock:
+        if _guard["baseline"] is None:
+            _guard["baseline"] = equity
+            _guard["start_date"] = int(time.time())
 
-    drawdown_usd = _guard["baseline"] - equity
-    drawdown_pct = (drawdown_usd / _guard["baseline"] * 100.0) if _guard["baseline"] else 0.0
+        drawdown_usd = _guard["baseline"] - equity
+        drawdown_pct = (drawdown_usd / _guard["baseline"] * 100.0) if _guard["baseline"] else 0.0
 
-    _guard["drawdown_usd"] = max(0.0, drawdown_usd)
-    _guard["drawdown_pct"] = max(0.0, drawdown_pct)
+        _guard["drawdown_usd"] = max(0.0, drawdown_usd)
+        _guard["drawdown_pct"] = max(0.0, drawdown_pct)
 
-    limit_hit = False
+        limit_hit = False
 
-    if _guard["limit_pct"] is not None and drawdown_pct >= _guard["limit_pct"]:
-        limit_hit = True
+        if _guard["limit_pct"] is not None and drawdown_pct >= _guard["limit_pct"]:
+            limit_hit = True
 
-    if _guard["limit_usd"] is not None and drawdown_usd >= _guard["limit_usd"]:
-        limit_hit = True
+        if _guard["limit_usd"] is not None and drawdown_usd >= _guard["limit_usd"]:
+            limit_hit = True
 
-    _guard["block"] = limit_hit
+        _guard["block"] = limit_hit
     return limit_hit
 
 
@@ -3832,9 +4345,9 @@ def cancel_all_orders_for_symbol(symbol: Optional[str] = None) -> Dict[str, Any]
         req.pop("settleCoin", None)
         req["symbol"] = normalize_symbol(symbol)
 
-    log(f"[REQ] order/cancel-all: {req}")
-    resp = bybit("POST", "/v5/order/cancel-all", req)
-    log(f"[RESP] order/cancel-all: {resp}")
+    log_exchange("[REQ] order/cancel-all", req)
+    resp = bybit("POST", "/v5/order/cancel-all", req, critical=True)
+    log_exchange("[RESP] order/cancel-all", resp)
 
     return resp
 
@@ -3859,15 +4372,15 @@ def close_position_market(position: Dict[str, Any]) -> Dict[str, Any]:
         "symbol": symbol,
         "side": close_side,
         "orderType": "Market",
-        "qty": fmt_qty(qty_rounded),
+        "qty": fmt_qty(qty_rounded, lot_step),
         "timeInForce": "IOC",
         "reduceOnly": True,
         "orderLinkId": link_id,
     }
 
-    log(f"[REQ] emergency close position: {req}")
-    resp = bybit("POST", "/v5/order/create", req)
-    log(f"[RESP] emergency close position: {resp}")
+    log_exchange("[REQ] emergency close position", req)
+    resp = bybit("POST", "/v5/order/create", req, critical=True)
+    log_exchange("[RESP] emergency close position", resp)
 
     order_id = ""
     try:
@@ -3903,6 +4416,8 @@ def close_position_market(position: Dict[str, Any]) -> Dict[str, Any]:
 
 def emergency_close_symbol_impl(symbol: str) -> Dict[str, Any]:
     symbol = normalize_symbol(symbol)
+    # Cancelling orders does not change the position, so read it while the cancel is in flight.
+    position_job = bybit_pool.submit(get_position_linear, symbol)
 
     try:
         cancel_resp = cancel_all_orders_for_symbol(symbol=symbol)
@@ -3926,7 +4441,7 @@ def emergency_close_symbol_impl(symbol: str) -> Dict[str, Any]:
             status="error",
         )
 
-    pos = get_position_linear(symbol)
+    pos = position_job.result()
     size = abs(float(pos.get("size", "0") or 0.0))
 
     if size <= 0:
@@ -3958,6 +4473,9 @@ def emergency_close_symbol_impl(symbol: str) -> Dict[str, Any]:
 
 
 def emergency_close_all_impl() -> Dict[str, Any]:
+    # As in the per-symbol path: the position list does not depend on the cancel.
+    positions_job = bybit_pool.submit(get_all_open_positions)
+
     try:
         cancel_resp = cancel_all_orders_for_symbol(symbol=None)
         write_system_log(
@@ -3980,12 +4498,15 @@ def emergency_close_all_impl() -> Dict[str, Any]:
             status="error",
         )
 
-    positions = get_all_open_positions()
+    positions = positions_job.result()
     results = []
 
-    for position in positions:
+    # Closes are independent per symbol; send them together and collect in position order.
+    close_jobs = [(position, bybit_pool.submit(close_position_market, position)) for position in positions]
+
+    for position, close_job in close_jobs:
         try:
-            results.append(close_position_market(position))
+            results.append(close_job.result())
         except Exception as exc:
             symbol = normalize_symbol(position.get("symbol", "UNKNOWN"))
             write_system_log(
@@ -4014,14 +4535,19 @@ def emergency_close_all_impl() -> Dict[str, Any]:
 # ROUTES
 # ============================================================
 
-@app.get("/", response_class=HTMLResponse)
-def root():
-    runtime_state = load_runtime_state()
-    return f"""
+_root_html_template: Optional[str] = None
+
+
+def root_html_template() -> str:
+    # Config-derived lines never change at runtime; render them once and only
+    # fill in the paused flag and timestamp per health probe.
+    global _root_html_template
+    if _root_html_template is None:
+        _root_html_template = f"""
     <h3>TV Webhook ↔ Bybit Risk Engine: OK</h3>
     <p>version: 6.8.0</p>
     <p>real_orders_enabled: {ENABLE_REAL_ORDERS}</p>
-    <p>trading_paused: {runtime_state.get("trading_paused")}</p>
+    <p>trading_paused: {{trading_paused}}</p>
     <p>supabase_enabled: {supabase_enabled()}</p>
     <p>telegram_enabled: {TELEGRAM_ENABLED}</p>
     <p>telegram_configured: {telegram_configured()}</p>
@@ -4042,14 +4568,21 @@ def root():
     <p>capital_allocation_enabled: {CAPITAL_ALLOCATION_ENABLED}</p>
     <p>telegram_configured: {telegram_configured()}</p>
     <p><a href="/dashboard_v2?secret=REPLACE_WITH_SECRET&days=7">Dashboard v2</a></p>
-    <p>time: {now_iso()}</p>
+    <p>time: {{now}}</p>
     <p><a href="/dashboard?secret=REPLACE_WITH_SECRET&days=7">Dashboard</a></p>
     """
+    return _root_html_template
+
+
+@app.get("/", response_class=HTMLResponse)
+def root():
+    runtime_state = load_runtime_state()
+    return root_html_template().format(trading_paused=runtime_state.get("trading_paused"), now=now_iso())
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard(secret: str, days: int = 7):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return HTMLResponse(
@@ -4060,7 +4593,7 @@ def dashboard(secret: str, days: int = 7):
 
 @app.get("/order_quality_config")
 def order_quality_config(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return {
@@ -4086,8 +4619,7 @@ def order_quality_config(secret: str):
 
 
 @app.post("/test_order_quality")
-async def test_order_quality(request: Request):
-    body = await request.json()
+def test_order_quality(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     return {
@@ -4097,8 +4629,7 @@ async def test_order_quality(request: Request):
 
 
 @app.post("/test_price_deviation")
-async def test_price_deviation(request: Request):
-    body = await request.json()
+def test_price_deviation(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     return {
@@ -4108,8 +4639,7 @@ async def test_price_deviation(request: Request):
 
 
 @app.post("/test_duplicate_signal")
-async def test_duplicate_signal(request: Request):
-    body = await request.json()
+def test_duplicate_signal(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     return {
@@ -4119,8 +4649,7 @@ async def test_duplicate_signal(request: Request):
 
 
 @app.post("/test_alert_idempotency")
-async def test_alert_idempotency(request: Request):
-    body = await request.json()
+def test_alert_idempotency(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     return {
@@ -4130,8 +4659,7 @@ async def test_alert_idempotency(request: Request):
 
 
 @app.post("/test_exposure")
-async def test_exposure(request: Request):
-    body = await request.json()
+def test_exposure(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     risk_pct_used = to_float_or_none(body.get("riskPct"))
@@ -4146,7 +4674,7 @@ async def test_exposure(request: Request):
 
 @app.get("/protection_status")
 def protection_status(secret: str, symbol: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return {
@@ -4157,21 +4685,20 @@ def protection_status(secret: str, symbol: str):
 
 @app.get("/dashboard_v2", response_class=HTMLResponse)
 def dashboard_v2(secret: str, days: int = 7):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return HTMLResponse(content=build_dashboard_v2_html(secret=secret, days=days), media_type="text/html")
 
 
 @app.get("/strategy_state")
 def strategy_state_get(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "state": load_state()}
 
 
 @app.post("/strategy_state_raw_update")
-async def strategy_state_raw_update(request: Request):
-    body = await request.json()
+def strategy_state_raw_update(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     require_strategy_admin()
     new_state = body.get("state")
@@ -4191,8 +4718,7 @@ async def strategy_state_raw_update(request: Request):
 
 
 @app.post("/strategy_side_update")
-async def strategy_side_update(request: Request):
-    body = await request.json()
+def strategy_side_update(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     result = set_strategy_side_config(
         strategy=body.get("strategy"),
@@ -4216,7 +4742,7 @@ def strategy_side_update_form(
     mode: Optional[str] = None,
     risk_pct: Optional[float] = None,
 ):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     result = set_strategy_side_config(
         strategy=strategy,
@@ -4234,7 +4760,7 @@ def strategy_side_update_form(
 
 @app.get("/trade_limits_status")
 def trade_limits_status(secret: str, strategy: str, symbol: str, side: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     payload = {"strategy": strategy, "symbol": symbol, "side": side}
     return {"ok": True, "trade_limits": validate_trade_limits(payload)}
@@ -4242,14 +4768,13 @@ def trade_limits_status(secret: str, strategy: str, symbol: str, side: str):
 
 @app.get("/order_lifecycle")
 def order_lifecycle(secret: str, symbol: Optional[str] = None, days: int = 7):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "lifecycle": build_order_lifecycle(symbol=symbol, days=days)}
 
 
 @app.post("/notify_test")
-async def notify_test(request: Request):
-    body = await request.json()
+def notify_test(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     result = safe_notify_event("✅ Trading bot test notification", body.get("message", "Notification test OK"), important=True)
     return {"ok": True, "notify": result}
@@ -4257,7 +4782,7 @@ async def notify_test(request: Request):
 
 @app.get("/telegram_status")
 def telegram_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -4279,7 +4804,7 @@ def telegram_status(secret: str):
 
 @app.post("/telegram_daily_report")
 def telegram_daily_report(secret: str, days: int = 1):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     message = format_daily_report_message(days=days)
     result = safe_notify_event("📊 Daily trading report", message, important=False)
@@ -4288,7 +4813,7 @@ def telegram_daily_report(secret: str, days: int = 1):
 
 @app.get("/telegram_daily_report")
 def telegram_daily_report_get(secret: str, days: int = 1):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     message = format_daily_report_message(days=days)
     result = safe_notify_event("📊 Daily trading report", message, important=False)
@@ -4308,8 +4833,7 @@ def cron_daily_report_post(secret: str, days: int = 1, force: bool = False):
 
 
 @app.post("/backtest_import")
-async def backtest_import(request: Request):
-    body = await request.json()
+def backtest_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows = body.get("rows")
     if rows is None and isinstance(body.get("data"), list):
@@ -4323,14 +4847,13 @@ async def backtest_import(request: Request):
 
 @app.get("/backtest_registry")
 def backtest_registry(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_backtest_registry()
 
 
 @app.post("/backtest_manual_import")
-async def backtest_manual_import(request: Request):
-    body = await request.json()
+def backtest_manual_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows = body.get("items") or body.get("rows") or body.get("data")
     if not isinstance(rows, list):
@@ -4361,8 +4884,7 @@ async def backtest_manual_import(request: Request):
 
 
 @app.post("/backtest_seed_known_candidates")
-async def backtest_seed_known_candidates(request: Request):
-    body = await request.json()
+def backtest_seed_known_candidates(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows = build_default_candidate_backtest_rows()
     final_rows = merge_backtest_rows(load_backtest_results(), rows)
@@ -4376,8 +4898,7 @@ async def backtest_seed_known_candidates(request: Request):
 
 
 @app.post("/backtest_registry_clear")
-async def backtest_registry_clear(request: Request):
-    body = await request.json()
+def backtest_registry_clear(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm", "")).upper()
     if confirm != "CLEAR_BACKTEST_REGISTRY":
@@ -4388,28 +4909,28 @@ async def backtest_registry_clear(request: Request):
 
 @app.get("/backtest_vs_live")
 def backtest_vs_live(secret: str, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_backtest_vs_live_report(days=days)
 
 
 @app.get("/data_model_export")
 def data_model_export(secret: str, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_data_model_export(days=days)
 
 
 @app.get("/dashboard_charts", response_class=HTMLResponse)
 def dashboard_charts(secret: str, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return HTMLResponse(content=build_dashboard_charts_html(secret=secret, days=days), media_type="text/html")
 
 
 @app.post("/trading_pause_on")
 def trading_pause_on(secret: str, reason: Optional[str] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     state = set_trading_paused(True, reason=reason or "Manual pause")
@@ -4440,7 +4961,7 @@ def trading_pause_on(secret: str, reason: Optional[str] = None):
 
 @app.post("/trading_pause_off")
 def trading_pause_off(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     state = set_trading_paused(False)
@@ -4471,7 +4992,7 @@ def trading_pause_off(secret: str):
 
 @app.get("/trading_pause_status")
 def trading_pause_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return {
@@ -4484,7 +5005,7 @@ def trading_pause_status(secret: str):
 
 @app.post("/emergency_close_all")
 def emergency_close_all(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     result = emergency_close_all_impl()
@@ -4505,7 +5026,7 @@ def emergency_close_all(secret: str):
 
 @app.post("/emergency_close_symbol")
 def emergency_close_symbol(secret: str, symbol: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     result = emergency_close_symbol_impl(symbol)
@@ -4527,7 +5048,7 @@ def emergency_close_symbol(secret: str, symbol: str):
 
 @app.post("/cancel_all_orders")
 def cancel_all_orders(secret: str, symbol: Optional[str] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     resp = cancel_all_orders_for_symbol(symbol=symbol)
@@ -4559,14 +5080,14 @@ def cancel_all_orders(secret: str, symbol: Optional[str] = None):
 
 @app.get("/state")
 def state(secret: Optional[str] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return load_state()
 
 
 @app.get("/logs")
 def logs(secret: str, limit: int = 100):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     limit = max(1, min(limit, 1000))
@@ -4581,7 +5102,7 @@ def logs(secret: str, limit: int = 100):
 
 @app.get("/logs_summary")
 def logs_summary(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return {
@@ -4592,7 +5113,7 @@ def logs_summary(secret: str):
 
 @app.get("/logs_csv")
 def logs_csv(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     ensure_trade_log()
@@ -4608,7 +5129,7 @@ def logs_csv(secret: str):
 
 @app.get("/db_logs")
 def db_logs(secret: str, limit: int = 100):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     if not supabase_enabled():
@@ -4631,7 +5152,7 @@ def db_logs(secret: str, limit: int = 100):
 
 @app.get("/db_logs_summary")
 def db_logs_summary(secret: str, limit: int = 1000):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     if not supabase_enabled():
@@ -4652,7 +5173,7 @@ def db_logs_summary(secret: str, limit: int = 1000):
 
 @app.get("/performance_report")
 def performance_report(secret: str, days: int = 1):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     if not supabase_enabled():
@@ -4669,7 +5190,7 @@ def performance_report(secret: str, days: int = 1):
 
 @app.get("/strategy_health")
 def strategy_health(secret: str, days: int = 7):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     if not supabase_enabled():
@@ -4686,7 +5207,7 @@ def strategy_health(secret: str, days: int = 7):
 
 @app.get("/closed_pnl_summary")
 def closed_pnl_summary(secret: str, days: int = 1, symbol: Optional[str] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     days = max(1, min(days, 30))
@@ -4712,7 +5233,7 @@ def closed_pnl_summary(secret: str, days: int = 1, symbol: Optional[str] = None)
 
 @app.get("/open_risk_summary")
 def open_risk_summary(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     return {
@@ -4723,7 +5244,7 @@ def open_risk_summary(secret: str):
 
 @app.get("/risk_status")
 def risk_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     state_data = load_state()
@@ -4792,26 +5313,28 @@ def risk_status(secret: str):
 
 @app.get("/guard_status")
 def guard_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
-    return {"ok": True, "status": _guard}
+    with _guard_lock:
+        status = dict(_guard)
+    return {"ok": True, "status": status}
 
 
 @app.post("/guard")
-async def guard_set(request: Request):
-    body = await request.json()
+def guard_set(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
-    _guard["enabled"] = bool(body.get("enable", False))
-    _guard["limit_pct"] = body.get("limit_pct")
-    _guard["limit_usd"] = body.get("limit_usd")
+    with _guard_lock:
+        _guard["enabled"] = bool(body.get("enable", False))
+        _guard["limit_pct"] = body.get("limit_pct")
+        _guard["limit_usd"] = body.get("limit_usd")
 
     return ok({"msg": "guard updated"})
 
 
 @app.get("/position")
 def position(symbol: str, secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     symbol = normalize_symbol(symbol)
@@ -4822,7 +5345,7 @@ def position(symbol: str, secret: str):
 
 @app.get("/open_positions_count")
 def open_positions_count(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     count = get_open_positions_count()
@@ -4832,20 +5355,324 @@ def open_positions_count(secret: str):
 
 @app.post("/set_leverage")
 async def set_lev(request: Request):
-    body = await request.json()
+    body = await json_body(request)
     verify_secret(request, body)
 
     symbol = normalize_symbol(body["symbol"])
     leverage = int(body["leverage"])
-    resp = set_leverage(symbol, leverage)
+    resp = await run_in_threadpool(set_leverage, symbol, leverage)
 
     return ok(resp)
 
 
+# ============================================================
+# BYBIT PRIVATE POSITION STREAM
+# ============================================================
+
+# Keyed by (symbol, positionIdx) so hedge-mode legs do not overwrite each other.
+_ws_positions: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_ws_position_seq: Dict[Tuple[str, int], int] = {}
+_ws_position_cond = threading.Condition()
+_ws_state: Dict[str, Any] = {"connected": False, "last_error": None}
+_ws_task: Optional[asyncio.Task] = None
+
+
+def ws_position_seq(symbol: str, position_idx: int = 0) -> int:
+    with _ws_position_cond:
+        return _ws_position_seq.get((symbol, position_idx), 0)
+
+
+def ws_wait_position(
+    symbol: str,
+    desired_side: str,
+    after_seq: int,
+    timeout: float,
+    position_idx: int = 0,
+) -> Optional[Dict[str, Any]]:
+    # Wait for a position update newer than after_seq showing size on desired_side.
+    # Give up early if the stream has said nothing about this position at all.
+    key = (symbol, position_idx)
+    started = time.monotonic()
+    deadline = started + timeout
+    first_msg_deadline = started + min(timeout, POSITION_WS_FIRST_MSG_SEC)
+    with _ws_position_cond:
+        while True:
+            seq = _ws_position_seq.get(key, 0)
+            position = _ws_positions.get(key)
+            if (
+                position
+                and seq > after_seq
+                and position["side"] == desired_side
+                and position["size"] > 0
+            ):
+                return position
+
+            now = time.monotonic()
+            if not _ws_state["connected"] or now >= deadline:
+                return None
+            if seq <= after_seq:
+                if now >= first_msg_deadline:
+                    return None
+                _ws_position_cond.wait(first_msg_deadline - now)
+            else:
+                _ws_position_cond.wait(deadline - now)
+
+
+def ws_handle_message(raw: Any) -> None:
+    msg = orjson.loads(raw)
+    if not str(msg.get("topic", "")).startswith("position"):
+        return
+
+    with _ws_position_cond:
+        for item in msg.get("data") or []:
+            symbol = item.get("symbol")
+            if not symbol:
+                continue
+            key = (symbol, int(item.get("positionIdx") or 0))
+            _ws_positions[key] = {
+                "side": item.get("side") or "",
+                "size": float(item.get("size", "0") or 0.0),
+                "avgPrice": item.get("entryPrice") or item.get("avgPrice") or "",
+                "markPrice": item.get("markPrice") or "",
+            }
+            _ws_position_seq[key] = _ws_position_seq.get(key, 0) + 1
+        _ws_position_cond.notify_all()
+
+
+def ws_set_connected(connected: bool) -> None:
+    with _ws_position_cond:
+        _ws_state["connected"] = connected
+        _ws_position_cond.notify_all()
+
+
+async def bybit_private_ws_loop() -> None:
+    backoff = 1.0
+    while True:
+        try:
+            async with websockets.connect(BYBIT_PRIVATE_WS_URL, ping_interval=None) as ws:
+                expires = int((time.time() + 10) * 1000)
+                mac = _BYBIT_HMAC.copy()
+                mac.update(f"GET/realtime{expires}".encode())
+                signature = mac.hexdigest()
+                await ws.send(orjson.dumps({"op": "auth", "args": [API_KEY, expires, signature]}).decode())
+                auth = orjson.loads(await asyncio.wait_for(ws.recv(), 10))
+                if not auth.get("success"):
+                    raise RuntimeError(f"ws auth rejected: {auth}")
+
+                await ws.send(orjson.dumps({"op": "subscribe", "args": ["position.linear"]}).decode())
+                ws_set_connected(True)
+                _ws_state["last_error"] = None
+                backoff = 1.0
+                log("[INFO] Bybit private ws connected (position.linear)")
+
+                while True:
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), 20)
+                    except asyncio.TimeoutError:
+                        await ws.send('{"op":"ping"}')
+                        continue
+                    ws_handle_message(raw)
+        except asyncio.CancelledError:
+            ws_set_connected(False)
+            raise
+        except Exception as e:
+            _ws_state["last_error"] = str(e)
+            log(f"[WARN] Bybit private ws dropped: {e}")
+
+        ws_set_connected(False)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
+
+
+@app.on_event("startup")
+async def start_bybit_private_ws() -> None:
+    global _ws_task
+    if not BYBIT_PRIVATE_WS_ENABLED:
+        return
+    if websockets is None:
+        log("[WARN] websockets not installed; post-entry position wait uses REST polling")
+        return
+    _ws_task = asyncio.create_task(bybit_private_ws_loop())
+
+
 # ============================================================
 # ORDER EXECUTION
 # ============================================================
 
+# Constant fields of the order bodies sent on every entry; callers copy and add
+# only the per-order values.
+_ENTRY_ORDER_TMPL: Dict[str, Any] = {
+    "category": "linear",
+    "orderType": "Market",
+    "timeInForce": "IOC",
+    "reduceOnly": False,
+}
+_TP_ORDER_TMPL: Dict[str, Any] = {
+    "category": "linear",
+    "orderType": "Limit",
+    "timeInForce": "GTC",
+    "reduceOnly": True,
+}
+_POSITION_SL_TMPL: Dict[str, Any] = {
+    "category": "linear",
+    "slTriggerBy": "MarkPrice",
+    "tpslMode": "Full",
+    "positionIdx": 0,
+}
+
+
+def tp_order_base(symbol: str, close_side: str) -> Dict[str, Any]:
+    # Fields shared by TP1/TP2; place_tp_order only adds price, qty and link id.
+    return {**_TP_ORDER_TMPL, "symbol": symbol, "side": close_side}
+
+
+def position_sl_request(symbol: str, sl: float, tick: float) -> Dict[str, Any]:
+    return {**_POSITION_SL_TMPL, "symbol": symbol, "stopLoss": fmt_price(sl, tick)}
+
+
+def entry_sl_rejected(resp: Dict[str, Any]) -> bool:
+    # Balance, qty, risk-limit and reduce-only rejections pass through untouched.
+    if resp.get("retCode") not in _ENTRY_SL_REJECT_CODES:
+        return False
+    msg = str(resp.get("retMsg") or "").lower()
+    return any(hint in msg for hint in _ENTRY_SL_REJECT_HINTS)
+
+
+def place_tp_order(
+    base: Dict[str, Any],
+    price: float,
+    qty: float,
+    tick: float,
+    link_id: str,
+    label: str,
+    lot_step: float = 0.0,
+) -> Optional[Dict[str, Any]]:
+    req = {**base, "price": fmt_price(price, tick), "qty": fmt_qty(qty, lot_step), "orderLinkId": link_id}
+
+    log_exchange(f"[REQ] order/create {label}", req)
+    try:
+        resp = bybit("POST", "/v5/order/create", req, critical=True)
+        log_exchange(f"[RESP] order/create {label}", resp)
+        return resp
+    except HTTPException as err:
+        log(f"[ERR] order/create {label} failed: {err.detail}")
+        return None
+
+
+def place_tp_orders(
+    base: Dict[str, Any],
+    legs: list[Tuple[float, float, str, str]],
+    tick: float,
+    lot_step: float = 0.0,
+) -> None:
+    # legs: (price, qty, link_id, label)
+    item_base = {key: value for key, value in base.items() if key != "category"}
+    batch_req = {
+        "category": base["category"],
+        "request": [
+            {**item_base, "price": fmt_price(price, tick), "qty": fmt_qty(qty, lot_step), "orderLinkId": link_id}
+            for price, qty, link_id, _ in legs
+        ],
+    }
+
+    log_exchange("[REQ] order/create-batch TP", batch_req)
+    try:
+        resp = bybit("POST", "/v5/order/create-batch", batch_req, critical=True)
+    except HTTPException as err:
+        resp = {"retCode": -1, "retMsg": str(err.detail)}
+
+    if resp.get("retCode") != 0:
+        # Whole batch rejected, nothing was placed; send the legs one by one.
+        log(f"[WARN] order/create-batch TP rejected, sending singly: {resp}")
+        for price, qty, link_id, label in legs:
+            place_tp_order(base, price, qty, tick, link_id, label, lot_step)
+        return
+
+    log_exchange("[RESP] order/create-batch TP", resp)
+    statuses = ((resp.get("retExtInfo") or {}).get("list")) or []
+    for (_, _, link_id, label), status in zip(legs, statuses):
+        if status.get("code") not in (0, None):
+            log(f"[ERR] order/create {label} failed in batch: {status}")
+
+
+# 34040 "not modified": the same SL is already on the position.
+_TRADING_STOP_OK_CODES = {0, 34040}
+
+
+def place_position_sl(symbol: str, sl: float, tick: float) -> Optional[Dict[str, Any]]:
+    # One body for the whole chain; only the trigger changes between attempts.
+    sl_req = position_sl_request(symbol, sl, tick)
+    sl_resp = None
+
+    for trigger in ("MarkPrice", "LastPrice"):
+        sl_req["slTriggerBy"] = trigger
+        log_exchange(f"[REQ] position/trading-stop SL {trigger}", sl_req)
+        try:
+            sl_resp = bybit("POST", "/v5/position/trading-stop", sl_req, critical=True)
+        except HTTPException as err:
+            log(f"[WARN] trading-stop {trigger} failed: {err.detail}")
+            continue
+        log_exchange(f"[RESP] position/trading-stop SL {trigger}", sl_resp)
+        if sl_resp.get("retCode") in _TRADING_STOP_OK_CODES:
+            return sl_resp
+        log(f"[WARN] trading-stop {trigger} rejected: {sl_resp.get('retMsg')}")
+
+    log("[ERR] trading-stop failed both triggers")
+    return None
+
+
+def position_poll_delays():
+    # Wall-clock deadline, so the time spent in each poll request counts too.
+    deadline = time.monotonic() + POSITION_POLL_TIMEOUT_SEC
+    for attempt in range(POSITION_POLL_MAX_ATTEMPTS):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        # Equal jitter: the floor of half the step keeps back-to-back polls from bunching up.
+        step = min(POSITION_POLL_CAP_SEC, POSITION_POLL_BASE_SEC * (2 ** attempt))
+        yield min(random.uniform(step / 2, step), remaining)
+
+
+def place_position_sl_early(
+    symbol: str,
+    sl: float,
+    tick: float,
+    desired_side: str = "",
+    ws_seq: Optional[int] = None,
+    position_idx: int = 0,
+) -> Optional[Dict[str, Any]]:
+    # Fired right after ENTRY: trading-stop is rejected until the position exists,
+    # so keep retrying on the poll backoff until Bybit accepts it.
+    # With the private stream up, hold the first attempt until the fill is seen
+    # instead of spending signed calls that Bybit would reject.
+    fill_seen = (
+        ws_seq is not None
+        and bool(desired_side)
+        and ws_wait_position(symbol, desired_side, ws_seq, POSITION_WS_WAIT_SEC, position_idx) is not None
+    )
+
+    sl_req = position_sl_request(symbol, sl, tick)
+
+    for i, delay in enumerate(position_poll_delays()):
+        if i or not fill_seen:
+            time.sleep(delay)
+        try:
+            sl_resp = bybit("POST", "/v5/position/trading-stop", sl_req, critical=True)
+        except HTTPException as err:
+            log(f"[WARN] early SL attempt {i + 1} failed: {err.detail}")
+            continue
+        except Exception as err:
+            log(f"[WARN] early SL attempt {i + 1} failed: {err}")
+            continue
+
+        if sl_resp.get("retCode") in _TRADING_STOP_OK_CODES:
+            log_exchange(f"[RESP] position/trading-stop SL (early, attempt {i + 1})", sl_resp)
+            return sl_resp
+
+    log("[WARN] early SL not accepted; falling back to post-poll SL")
+    return None
+
+
 def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str, Any]:
     exchange = body.get("exchange", "bybit").lower()
     if exchange != "bybit":
@@ -4863,19 +5690,26 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
     sl = float(body.get("sl")) if body.get("sl") is not None else None
     qty_in = body.get("qty")
 
-    tick, lot_step, min_qty = get_instrument(symbol)
-    log(f"[INFO] {symbol} tick={tick} lot={lot_step} min_qty={min_qty}")
+    if qty_in is None and sl is None:
+        raise HTTPException(400, "sl is required when qty is not provided")
+
+    # Instrument, position and (for risk sizing) equity + last price are
+    # independent reads; fetch them together instead of one after another.
+    instrument_job = bybit_pool.submit(get_instrument, symbol)
+    position_job = bybit_pool.submit(get_position_linear, symbol)
+    equity_job = bybit_pool.submit(get_equity_usdt) if qty_in is None else None
+    last_px_job = bybit_pool.submit(get_ticker_last, symbol) if qty_in is None else None
+
+    tick, lot_step, min_qty = instrument_job.result()
+    log_debug("[DEBUG] %s tick=%s lot=%s min_qty=%s", symbol, tick, lot_step, min_qty)
 
     if qty_in is not None:
         qty_calc = float(qty_in)
         qty_rounded = max(round_step(qty_calc, lot_step), min_qty)
         log(f"[INFO] sizing=explicit qty={qty_rounded}")
     else:
-        if sl is None:
-            raise HTTPException(400, "sl is required when qty is not provided")
-
-        equity = get_equity_usdt()
-        last_px = get_ticker_last(symbol)
+        equity = equity_job.result()
+        last_px = last_px_job.result()
         stop_dist = abs(last_px - sl)
 
         if stop_dist <= 0:
@@ -4894,13 +5728,14 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
 
     desired_side = bybit_order_side(side_s)
 
-    pos = get_position_linear(symbol)
+    pos = position_job.result()
     current_side = pos.get("side") or ""
     current_size = float(pos.get("size", "0") or 0.0)
 
     actual_qty = qty_rounded
+    flipping = bool(current_size > 0 and current_side and current_side != desired_side)
 
-    if current_size > 0 and current_side and current_side != desired_side:
+    if flipping:
         flip_qty = current_size + qty_rounded
         actual_qty = max(round_step(flip_qty, lot_step), min_qty)
         log(
@@ -4911,19 +5746,34 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
     link_id = f"TV-{symbol}-{now_ms()}"
 
     entry_req = {
-        "category": "linear",
+        **_ENTRY_ORDER_TMPL,
         "symbol": symbol,
         "side": desired_side,
-        "orderType": "Market",
-        "qty": fmt_qty(actual_qty),
-        "timeInForce": "IOC",
-        "reduceOnly": False,
+        "qty": fmt_qty(actual_qty, lot_step),
         "orderLinkId": link_id,
     }
 
-    log(f"[REQ] order/create ENTRY: {entry_req}")
+    # Not on a flip: the attached SL would apply to the order closing the old side.
+    attach_sl = ENTRY_ATTACH_SL_ENABLED and sl is not None and not flipping
+    if attach_sl:
+        entry_req.update(stopLoss=fmt_price(sl, tick), slTriggerBy="MarkPrice", tpslMode="Full")
+
+    # The stream keys positions by positionIdx; wait on the leg this entry targets.
+    position_idx = int(entry_req.get("positionIdx") or 0)
+    ws_seq = ws_position_seq(symbol, position_idx)
+
+    log_exchange("[REQ] order/create ENTRY", entry_req)
     entry_resp = bybit("POST", "/v5/order/create", entry_req)
-    log(f"[RESP] order/create ENTRY: {entry_resp}")
+    log_exchange("[RESP] order/create ENTRY", entry_resp)
+
+    sl_attached = attach_sl and entry_resp.get("retCode") == 0
+    if attach_sl and entry_sl_rejected(entry_resp):
+        # Rejected orders are not created, so resending without the SL cannot double the entry.
+        log(f"[WARN] ENTRY with attached SL rejected ({entry_resp.get('retMsg')}); resending without SL")
+        for key in ("stopLoss", "slTriggerBy", "tpslMode"):
+            entry_req.pop(key, None)
+        entry_resp = bybit("POST", "/v5/order/create", entry_req)
+        log_exchange("[RESP] order/create ENTRY", entry_resp)
 
     order_id = ""
     try:
@@ -4931,15 +5781,29 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
     except Exception:
         order_id = ""
 
+    # Not on a flip: until the fill lands, trading-stop would target the old opposite position.
+    # A rejected entry never fills, so there is nothing for the early SL to protect.
+    early_sl_job = None
+    if sl is not None and not sl_attached and not flipping and entry_resp.get("retCode") == 0:
+        early_sl_job = bybit_pool.submit(place_position_sl_early, symbol, sl, tick, desired_side, ws_seq, position_idx)
+
     size = 0.0
     side_now = ""
 
-    for i in range(12):
-        time.sleep(0.25)
+    ws_pos = ws_wait_position(symbol, desired_side, ws_seq, POSITION_WS_WAIT_SEC, position_idx)
+    filled_pos: Dict[str, Any] = ws_pos or {}
+    if ws_pos is not None:
+        side_now = ws_pos["side"]
+        size = ws_pos["size"]
+        log_debug("[DEBUG] ws pos: side=%s size=%s", side_now, size)
+
+    for i, delay in enumerate(position_poll_delays() if ws_pos is None else ()):
+        time.sleep(delay)
         p = get_position_linear(symbol)
+        filled_pos = p
         side_now = p.get("side") or ""
         size = float(p.get("size", "0") or 0.0)
-        log(f"[INFO] poll pos {i + 1}/12: side={side_now} size={size}")
+        log_debug("[DEBUG] poll pos %d (+%.3fs): side=%s size=%s", i + 1, delay, side_now, size)
 
         if size > 0.0 and side_now == desired_side:
             break
@@ -4964,81 +5828,46 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
         tp1_qty = 0.0
         tp2_qty = round_step(size, lot_step)
 
-    log(f"[INFO] tp1_qty={tp1_qty} tp2_qty={tp2_qty}")
+    log_debug("[DEBUG] tp1_qty=%s tp2_qty=%s", tp1_qty, tp2_qty)
 
-    if tp1_qty > 0 and tp1 is not None:
-        tp1_req = {
-            "category": "linear",
-            "symbol": symbol,
-            "side": opposite_bybit_side(desired_side),
-            "orderType": "Limit",
-            "price": fmt_price(tp1, tick),
-            "qty": fmt_qty(tp1_qty),
-            "timeInForce": "GTC",
-            "reduceOnly": True,
-            "orderLinkId": f"{link_id}-TP1",
-        }
+    tp_base = tp_order_base(symbol, opposite_bybit_side(desired_side))
+    protection_jobs = []
+    tp_legs = []
 
-        log(f"[REQ] order/create TP1: {tp1_req}")
-        try:
-            tp1_resp = bybit("POST", "/v5/order/create", tp1_req)
-            log(f"[RESP] order/create TP1: {tp1_resp}")
-        except HTTPException as err:
-            log(f"[ERR] order/create TP1 failed: {err.detail}")
+    if tp1_qty > 0 and tp1 is not None:
+        tp_legs.append((tp1, tp1_qty, f"{link_id}-TP1", "TP1"))
 
     if tp2_qty > 0 and tp2 is not None:
-        tp2_req = {
-            "category": "linear",
-            "symbol": symbol,
-            "side": opposite_bybit_side(desired_side),
-            "orderType": "Limit",
-            "price": fmt_price(tp2, tick),
-            "qty": fmt_qty(tp2_qty),
-            "timeInForce": "GTC",
-            "reduceOnly": True,
-            "orderLinkId": f"{link_id}-TP2",
-        }
-
-        log(f"[REQ] order/create TP2: {tp2_req}")
-        try:
-            tp2_resp = bybit("POST", "/v5/order/create", tp2_req)
-            log(f"[RESP] order/create TP2: {tp2_resp}")
-        except HTTPException as err:
-            log(f"[ERR] order/create TP2 failed: {err.detail}")
-
-    if sl is not None:
-        sl_req = {
-            "category": "linear",
-            "symbol": symbol,
-            "stopLoss": fmt_price(sl, tick),
-            "slTriggerBy": "MarkPrice",
-            "tpslMode": "Full",
-            "positionIdx": 0,
-        }
-
-        log(f"[REQ] position/trading-stop SL MarkPrice: {sl_req}")
-
-        try:
-            sl_resp = bybit("POST", "/v5/position/trading-stop", sl_req)
-            log(f"[RESP] position/trading-stop SL: {sl_resp}")
-        except HTTPException as err:
-            log(f"[WARN] trading-stop MarkPrice failed: {err.detail}")
+        tp_legs.append((tp2, tp2_qty, f"{link_id}-TP2", "TP2"))
 
-            sl_req_last = dict(sl_req)
-            sl_req_last["slTriggerBy"] = "LastPrice"
+    if TP_BATCH_ENABLED and len(tp_legs) > 1:
+        protection_jobs.append(bybit_pool.submit(place_tp_orders, tp_base, tp_legs, tick, lot_step))
+    else:
+        for price, qty, tp_link_id, label in tp_legs:
+            protection_jobs.append(
+                bybit_pool.submit(place_tp_order, tp_base, price, qty, tick, tp_link_id, label, lot_step)
+            )
 
-            log(f"[REQ] position/trading-stop SL LastPrice: {sl_req_last}")
-
-            try:
-                sl_resp_last = bybit("POST", "/v5/position/trading-stop", sl_req_last)
-                log(f"[RESP] position/trading-stop SL LastPrice: {sl_resp_last}")
-            except HTTPException as err2:
-                log(f"[ERR] trading-stop failed both triggers: {err2.detail}")
+    early_sl_resp = None
+    if early_sl_job is not None and early_sl_job.exception() is None:
+        early_sl_resp = early_sl_job.result()
+    if sl is not None and not sl_attached and early_sl_resp is None:
+        # Any early-SL failure, raised or not, leaves the post-poll SL to protect the fill.
+        protection_jobs.append(bybit_pool.submit(place_position_sl, symbol, sl, tick))
+
+    # The TP batch and the SL are independent; send them together and wait for both.
+    # One leg failing must not abort the others once the entry has filled.
+    wait(protection_jobs)
+    for job in protection_jobs:
+        exc = job.exception()
+        if exc is not None:
+            log(f"[ERR] protection order failed: {exc}")
 
     return {
         "msg": "entry+tp/sl processed",
         "order_id": order_id,
         "entry_resp": entry_resp,
+        "position": filled_pos,
     }
 
 
@@ -5050,17 +5879,34 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
 async def tv_webhook(request: Request):
     raw = await request.body()
 
+    # TradingView keep-alive pings: answer from cached bytes without parsing or logging.
+    if raw.startswith(b'{"type":"ping"'):
+        return Response(content=_PONG_BODY, media_type="application/json")
+
+    # The alert pipeline is synchronous (Bybit, Supabase, Telegram, local files).
+    # Run it in the dedicated webhook pool so exchange round-trips never block the event loop.
+    return await asyncio.get_running_loop().run_in_executor(webhook_pool, process_tv_alert, request, raw)
+
+
+_SECRET_IN_RAW = re.compile(rb'("(?:secret|api_key|api_secret|password|token)"\s*:\s*")[^"]*', re.IGNORECASE)
+
+
+def process_tv_alert(request: Request, raw: bytes):
     try:
-        body = json.loads(raw)
+        body = orjson.loads(raw)
     except Exception:
+        # Only decode the raw bytes on this error path, and only a bounded, secret-masked prefix.
+        preview = _SECRET_IN_RAW.sub(rb"\1***", raw[:512]).decode("utf-8", "ignore")
+        log(f"INCOMING /tv INVALID JSON ({len(raw)} bytes): {preview!r}")
         raise HTTPException(400, "Invalid JSON")
 
     if isinstance(body, dict) and body.get("type") == "ping":
-        log(f"INCOMING /tv RAW: {json.dumps(sanitize_payload(body))}")
+        log(f"INCOMING /tv RAW: {orjson.dumps(sanitize_payload(body)).decode()}")
         return ok({"msg": "pong"})
 
     try:
-        safe_raw_for_log = json.dumps(sanitize_payload(json.loads(raw)), ensure_ascii=False)
+        # sanitize_payload copies, so the parsed body can be reused instead of decoding raw again.
+        safe_raw_for_log = json_bytes(sanitize_payload(body)).decode()
     except Exception:
         safe_raw_for_log = "<unparseable payload>"
 
@@ -5752,7 +6598,6 @@ def extract_paper_event(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             # ISO UTC string parse without external dependencies.
             cleaned = str(created_at).replace("Z", "+00:00")
-            import datetime as _dt
             bar_time_ms = int(_dt.datetime.fromisoformat(cleaned).timestamp() * 1000)
         except Exception:
             bar_time_ms = int(time.time() * 1000)
@@ -6033,7 +6878,7 @@ def summarize_paper_outcomes(outcomes: list[Dict[str, Any]]) -> Dict[str, Any]:
 
 @app.get("/paper_outcome_scan")
 def paper_outcome_scan(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = 100):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     events = fetch_paper_events_for_outcome(days=days, limit=limit)
     outcomes = [evaluate_paper_trade(event) for event in events]
@@ -6042,7 +6887,7 @@ def paper_outcome_scan(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limi
 
 @app.get("/paper_outcome_summary")
 def paper_outcome_summary(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = 300):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     events = fetch_paper_events_for_outcome(days=days, limit=limit)
     outcomes = [evaluate_paper_trade(event) for event in events]
@@ -6051,7 +6896,7 @@ def paper_outcome_summary(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, l
 
 @app.get("/paper_outcome_open")
 def paper_outcome_open(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = 300):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     events = fetch_paper_events_for_outcome(days=days, limit=limit)
     outcomes = [evaluate_paper_trade(event) for event in events]
@@ -6061,7 +6906,7 @@ def paper_outcome_open(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limi
 
 @app.get("/paper_outcome_event")
 def paper_outcome_event(secret: str, event_id: int, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     events = fetch_paper_events_for_outcome(days=days, limit=PAPER_OUTCOME_MAX_EVENTS)
     for event in events:
@@ -6075,7 +6920,7 @@ def paper_outcome_event(secret: str, event_id: int, days: int = 30):
 
 @app.get("/paper_outcome_config")
 def paper_outcome_config(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -6106,8 +6951,7 @@ def paper_outcome_config(secret: str):
 def read_json_file(path: Path, default: Any) -> Any:
     try:
         if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json_bytes(path.read_bytes())
     except Exception as exc:
         log(f"[WARN] read_json_file failed for {path}: {exc}")
     return default
@@ -6318,21 +7162,21 @@ def format_paper_decision_report_message(report: Dict[str, Any]) -> str:
 
 @app.get("/paper_outcome_decisions")
 def paper_outcome_decisions(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS, include_outcomes: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_paper_outcome_decision_report(days=days, limit=limit, include_outcomes=include_outcomes)
 
 
 @app.get("/candidate_monitor")
 def candidate_monitor(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_paper_outcome_decision_report(days=days, limit=limit, include_outcomes=False)
 
 
 @app.get("/candidate_monitor_dashboard", response_class=HTMLResponse)
 def candidate_monitor_dashboard(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_paper_outcome_decision_report(days=days, limit=limit, include_outcomes=False)
     rows = []
@@ -6370,7 +7214,7 @@ def candidate_monitor_dashboard(secret: str, days: int = PAPER_OUTCOME_DEFAULT_D
 
 @app.get("/paper_backtest_alignment")
 def paper_backtest_alignment(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_paper_outcome_decision_report(days=days, limit=limit, include_outcomes=False)
     return {
@@ -6395,7 +7239,7 @@ def paper_backtest_alignment(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS
 
 @app.get("/candidate_backtest_template")
 def candidate_backtest_template(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     state = load_state()
     rows = []
@@ -6534,7 +7378,7 @@ def format_paper_strategy_guard_message(plan: Dict[str, Any]) -> str:
 
 @app.get("/paper_strategy_guard_config")
 def paper_strategy_guard_config(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -6551,14 +7395,13 @@ def paper_strategy_guard_config(secret: str):
 
 @app.get("/paper_strategy_guard_plan")
 def paper_strategy_guard_plan(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_paper_strategy_guard_plan(days=days, limit=limit)
 
 
 @app.post("/paper_strategy_guard_run")
-async def paper_strategy_guard_run(request: Request):
-    body = await request.json()
+def paper_strategy_guard_run(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     days = int(body.get("days", PAPER_OUTCOME_DEFAULT_DAYS))
     limit = int(body.get("limit", PAPER_OUTCOME_MAX_EVENTS))
@@ -6635,7 +7478,7 @@ def supabase_insert_optional(table_name: str, payload: Dict[str, Any]) -> Dict[s
         resp = client.post(
             supabase_url_for_table(table_name),
             headers=supabase_headers(),
-            json=payload,
+            content=json_bytes(payload),
         )
         if resp.status_code >= 400:
             # Optional physical split tables are allowed to be absent during migration.
@@ -6721,10 +7564,7 @@ def validate_payload_schema(body: Dict[str, Any]) -> Dict[str, Any]:
     if payload_version and str(payload_version) not in SUPPORTED_PAYLOAD_VERSIONS:
         errors.append(f"UNSUPPORTED_PAYLOAD_VERSION_{payload_version}")
 
-    required = ["strategy", "symbol", "side", "orderType", "signalPrice", "sl", "tp1", "tp2", "riskPct", "barTime"]
-    for key in required:
-        if key not in body or body.get(key) in (None, ""):
-            errors.append(f"MISSING_{key}")
+    errors.extend(f"MISSING_{key}" for key in PAYLOAD_REQUIRED_FIELDS if body.get(key) in (None, ""))
 
     if "side" in body and str(body.get("side", "")).upper() not in {"LONG", "SHORT"}:
         errors.append("INVALID_SIDE")
@@ -6732,9 +7572,9 @@ def validate_payload_schema(body: Dict[str, Any]) -> Dict[str, Any]:
     if "orderType" in body and str(body.get("orderType", "Market")) != "Market":
         errors.append("UNSUPPORTED_ORDER_TYPE")
 
-    numeric_fields = ["signalPrice", "sl", "tp1", "tp2", "riskPct"]
-    for key in numeric_fields:
-        if key in body and body.get(key) not in (None, "") and to_float_or_none(body.get(key)) is None:
+    for key in PAYLOAD_NUMERIC_FIELDS:
+        value = body.get(key)
+        if value not in (None, "") and to_float_or_none(value) is None:
             errors.append(f"INVALID_NUMERIC_{key}")
 
     if not payload_version:
@@ -6748,7 +7588,7 @@ def validate_payload_schema(body: Dict[str, Any]) -> Dict[str, Any]:
             "supported_versions": SUPPORTED_PAYLOAD_VERSIONS,
             "warnings": warnings,
             "errors": errors,
-            "required_fields": required,
+            "required_fields": list(PAYLOAD_REQUIRED_FIELDS),
         },
     }
 
@@ -6938,7 +7778,10 @@ def assess_order_execution_quality(body: Dict[str, Any], result: Dict[str, Any],
         return {"ok": False, "reason": "MISSING_SIGNAL_PRICE", "details": {"symbol": symbol, "order_id": order_id}}
     details: Dict[str, Any] = {"symbol": symbol, "order_id": order_id, "signal_price": signal_price}
     try:
-        pos = get_position_linear(symbol)
+        # Reuse the fill the entry path already observed; only re-query if it lacks prices.
+        pos = result.get("position") or {}
+        if not (pos.get("avgPrice") or pos.get("markPrice")):
+            pos = get_position_linear(symbol)
         avg_price = to_float_or_none(pos.get("avgPrice"))
         mark_price = to_float_or_none(pos.get("markPrice"))
         details.update({"avg_price": avg_price, "mark_price": mark_price, "position": pos})
@@ -7149,7 +7992,7 @@ def handle_telegram_command_text(text: str) -> Dict[str, Any]:
 
 @app.get("/payload_schema")
 def payload_schema(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -7176,36 +8019,35 @@ def payload_schema(secret: str):
 
 
 @app.post("/validate_payload")
-async def validate_payload_endpoint(request: Request):
-    body = await request.json()
+def validate_payload_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     return {"ok": True, "payload_validation": validate_payload_schema(body)}
 
 
 @app.get("/reconciliation_report")
 def reconciliation_report(secret: str, days: int = RECONCILIATION_LOOKBACK_DAYS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "report": build_reconciliation_report(days=days)}
 
 
 @app.get("/recovery_status")
 def recovery_status(secret: str, days: int = RECONCILIATION_LOOKBACK_DAYS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "recovery": build_recovery_status(days=days)}
 
 
 @app.post("/recovery_scan")
 def recovery_scan(secret: str, days: int = RECONCILIATION_LOOKBACK_DAYS, notify: bool = True):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "recovery": run_recovery_scan(days=days, notify=notify)}
 
 
 @app.get("/execution_quality")
 def execution_quality(secret: str, symbol: str, signal_price: Optional[float] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     body = {"symbol": symbol, "side": "LONG", "signalPrice": signal_price or get_ticker_last(normalize_symbol(symbol))}
     return {"ok": True, "execution_quality": assess_order_execution_quality(body, {}, "manual_check")}
@@ -7213,7 +8055,7 @@ def execution_quality(secret: str, symbol: str, signal_price: Optional[float] =
 
 @app.get("/capital_allocation_status")
 def capital_allocation_status(secret: str, strategy: Optional[str] = None):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     open_risk = summarize_open_risk()
     state = load_state()
@@ -7237,21 +8079,20 @@ def capital_allocation_status(secret: str, strategy: Optional[str] = None):
 
 @app.get("/promotion_status")
 def promotion_status(secret: str, strategy: str, symbol: str, side: str, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "promotion": compute_promotion_status(strategy, symbol, side, days=days)}
 
 
 @app.get("/promotion_all")
 def promotion_all(secret: str, days: int = 30):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_all_promotion_status(days=days)
 
 
 @app.post("/telegram_command")
-async def telegram_command(request: Request):
-    body = await request.json()
+def telegram_command(request: Request, body: Any = Depends(json_body)):
     if body.get("secret"):
         verify_secret(request, body)
         source_chat_id = str(body.get("chat_id") or TELEGRAM_CHAT_ID)
@@ -7268,7 +8109,7 @@ async def telegram_command(request: Request):
 
 @app.get("/telegram_command")
 def telegram_command_get(secret: str, text: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     result = handle_telegram_command_text_secure(text, str(TELEGRAM_CHAT_ID))
     if TELEGRAM_ENABLED and result.get("response"):
@@ -7278,14 +8119,14 @@ def telegram_command_get(secret: str, text: str):
 
 @app.get("/strategy_review_report")
 def strategy_review_report(secret: str, days: int = STRATEGY_REVIEW_LOOKBACK_DAYS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_strategy_review_report(days=days)
 
 
 @app.get("/supabase_split_model")
 def supabase_split_model(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -7309,12 +8150,18 @@ def supabase_split_model(secret: str):
 
 @app.post("/adjust")
 async def adjust(request: Request):
-    body = await request.json()
+    body = await json_body(request)
     verify_secret(request, body)
 
+    return await run_in_threadpool(adjust_position_impl, body)
+
+
+def adjust_position_impl(body: Dict[str, Any]):
     symbol = normalize_symbol(body["symbol"])
     action = body["action"]
 
+    # One position read serves every action; the tick lookup overlaps with it.
+    instrument_job = bybit_pool.submit(get_instrument, symbol)
     pos = get_position_linear(symbol)
     size = float(pos.get("size", "0") or 0.0)
     side = pos.get("side") or ""
@@ -7322,7 +8169,8 @@ async def adjust(request: Request):
     if size <= 0.0 or not side:
         raise HTTPException(400, "No open position")
 
-    tick, _, _ = get_instrument(symbol)
+    tick, _, _ = instrument_job.result()
+    trading_stop_base = {"category": "linear", "symbol": symbol, "tpslMode": "Full", "positionIdx": 0}
 
     if action == "be":
         be_offset_bp = int(body.get("be_offset_bp", 0))
@@ -7333,68 +8181,42 @@ async def adjust(request: Request):
 
         be_px = entry * (1.0 + (be_offset_bp / 10000.0)) if side == "Buy" else entry * (1.0 - (be_offset_bp / 10000.0))
 
-        req = {
-            "category": "linear",
-            "symbol": symbol,
-            "tpslMode": "Full",
-            "stopLoss": fmt_price(be_px, tick),
-            "slTriggerBy": "MarkPrice",
-            "positionIdx": 0,
-        }
+        req = position_sl_request(symbol, be_px, tick)
 
-        log(f"[REQ] trading-stop BE: {req}")
+        log_exchange("[REQ] trading-stop BE", req)
         resp = bybit("POST", "/v5/position/trading-stop", req)
-        log(f"[RESP] trading-stop BE: {resp}")
+        log_exchange("[RESP] trading-stop BE", resp)
 
         return ok({"msg": "be set"})
 
     if action == "trail":
         trail_dist = float(body["trail_dist"])
 
-        req = {
-            "category": "linear",
-            "symbol": symbol,
-            "tpslMode": "Full",
-            "trailingStop": fmt_qty(trail_dist),
-            "positionIdx": 0,
-        }
+        req = {**trading_stop_base, "trailingStop": fmt_price(trail_dist, tick)}
 
-        log(f"[REQ] trading-stop trail: {req}")
+        log_exchange("[REQ] trading-stop trail", req)
         resp = bybit("POST", "/v5/position/trading-stop", req)
-        log(f"[RESP] trading-stop trail: {resp}")
+        log_exchange("[RESP] trading-stop trail", resp)
 
         return ok({"msg": "trail set"})
 
     if action == "cancel_trail":
-        req = {
-            "category": "linear",
-            "symbol": symbol,
-            "tpslMode": "Full",
-            "trailingStop": "0",
-            "positionIdx": 0,
-        }
+        req = {**trading_stop_base, "trailingStop": "0"}
 
-        log(f"[REQ] trading-stop cancel trail: {req}")
+        log_exchange("[REQ] trading-stop cancel trail", req)
         resp = bybit("POST", "/v5/position/trading-stop", req)
-        log(f"[RESP] trading-stop cancel trail: {resp}")
+        log_exchange("[RESP] trading-stop cancel trail", resp)
 
         return ok({"msg": "trail canceled"})
 
     if action == "set_sl":
         sl = float(body["sl"])
 
-        req = {
-            "category": "linear",
-            "symbol": symbol,
-            "tpslMode": "Full",
-            "stopLoss": fmt_price(sl, tick),
-            "slTriggerBy": "MarkPrice",
-            "positionIdx": 0,
-        }
+        req = position_sl_request(symbol, sl, tick)
 
-        log(f"[REQ] trading-stop set_sl: {req}")
+        log_exchange("[REQ] trading-stop set_sl", req)
         resp = bybit("POST", "/v5/position/trading-stop", req)
-        log(f"[RESP] trading-stop set_sl: {resp}")
+        log_exchange("[RESP] trading-stop set_sl", resp)
 
         return ok({"msg": "sl set"})
 
@@ -7425,6 +8247,9 @@ AUDIT_PAYLOAD_HASH_ENABLED = os.getenv("AUDIT_PAYLOAD_HASH_ENABLED", "true").low
 BYBIT_RETRY_ENABLED = os.getenv("BYBIT_RETRY_ENABLED", "true").lower() == "true"
 BYBIT_RETRY_ATTEMPTS = int(os.getenv("BYBIT_RETRY_ATTEMPTS", "3"))
 BYBIT_RETRY_SLEEP_SEC = float(os.getenv("BYBIT_RETRY_SLEEP_SEC", "0.35"))
+BYBIT_RETRY_MAX_SLEEP_SEC = float(os.getenv("BYBIT_RETRY_MAX_SLEEP_SEC", "2.0"))
+BYBIT_BREAKER_THRESHOLD = int(os.getenv("BYBIT_BREAKER_THRESHOLD", "5"))
+BYBIT_BREAKER_COOLDOWN_SEC = float(os.getenv("BYBIT_BREAKER_COOLDOWN_SEC", "15"))
 ORDER_VERIFY_AFTER_ENTRY = os.getenv("ORDER_VERIFY_AFTER_ENTRY", "true").lower() == "true"
 ORDER_VERIFY_SLEEP_SEC = float(os.getenv("ORDER_VERIFY_SLEEP_SEC", "0.5"))
 ORDER_VERIFY_RETRIES = int(os.getenv("ORDER_VERIFY_RETRIES", "4"))
@@ -7461,15 +8286,11 @@ def json_hash(data: Any) -> str:
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def supabase_url_for_table(table: str) -> str:
-    return f"{SUPABASE_URL}/rest/v1/{table}"
-
-
 def supabase_optional_insert(table: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     if not supabase_enabled():
         return {"ok": False, "reason": "SUPABASE_DISABLED"}
     try:
-        resp = client.post(supabase_url_for_table(table), headers=supabase_headers(), json=payload)
+        resp = client.post(supabase_url_for_table(table), headers=supabase_headers(), content=json_bytes(payload))
         if resp.status_code >= 400:
             log(f"[WARN] optional Supabase insert failed table={table}: {resp.status_code} {resp.text}")
             return {"ok": False, "status_code": resp.status_code, "reason": resp.text}
@@ -7494,30 +8315,95 @@ def write_audit_event(event_type: str, payload: Dict[str, Any], status: str = "l
 
 _V65_BASE_BYBIT = bybit
 
-def bybit(method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+_BYBIT_RATE_LIMIT_CODES = {10006, 10018}
+_BYBIT_TRANSIENT_CODES = {10000, 10002, 10016} | _BYBIT_RATE_LIMIT_CODES
+_bybit_breaker: Dict[str, Any] = {"failures": 0, "open_until": 0.0}
+_bybit_breaker_lock = threading.Lock()
+
+
+def bybit_retry_delay(attempt: int, rate_limited: bool = False) -> float:
+    # On rate limits, sleep until the reset Bybit reports; otherwise full-jitter backoff.
+    headers = getattr(_bybit_last, "headers", None) if rate_limited else None
+    if headers is not None:
+        retry_after = to_float_or_none(headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(max(0.0, retry_after), BYBIT_RETRY_MAX_SLEEP_SEC)
+        reset_ms = to_float_or_none(headers.get("X-Bapi-Limit-Reset-Timestamp"))
+        if reset_ms:
+            return min(max(0.0, reset_ms / 1000.0 - time.time()), BYBIT_RETRY_MAX_SLEEP_SEC)
+    return random.uniform(0.0, min(BYBIT_RETRY_MAX_SLEEP_SEC, BYBIT_RETRY_SLEEP_SEC * (2 ** (attempt - 1))))
+
+
+_BYBIT_ENTRY_PATHS = {"/v5/order/create", "/v5/order/create-batch"}
+
+
+def bybit_opens_exposure(path: str, params: Union[Dict[str, Any], str, None]) -> bool:
+    # Only orders that can add exposure are gated; reads, SL/TP, cancels and
+    # reduce-only closes must reach Bybit even while the breaker is open.
+    if path not in _BYBIT_ENTRY_PATHS or not isinstance(params, dict):
+        return False
+    batch = params.get("request")
+    items = batch if isinstance(batch, list) else [params]
+    return any(item.get("reduceOnly") is not True for item in items)
+
+
+def bybit_breaker_check() -> None:
+    with _bybit_breaker_lock:
+        open_until = _bybit_breaker["open_until"]
+    if time.monotonic() < open_until:
+        raise HTTPException(503, "Bybit circuit open; failing fast")
+
+
+def bybit_breaker_record(success: bool) -> None:
+    if BYBIT_BREAKER_THRESHOLD <= 0:
+        return
+    with _bybit_breaker_lock:
+        if success:
+            _bybit_breaker["failures"] = 0
+            return
+        _bybit_breaker["failures"] += 1
+        if _bybit_breaker["failures"] < BYBIT_BREAKER_THRESHOLD:
+            return
+        _bybit_breaker["failures"] = 0
+        _bybit_breaker["open_until"] = time.monotonic() + BYBIT_BREAKER_COOLDOWN_SEC
+    log(f"[ERR] Bybit circuit open for {BYBIT_BREAKER_COOLDOWN_SEC}s after {BYBIT_BREAKER_THRESHOLD} consecutive failed calls")
+
+
+def bybit(method: str, path: str, params: Union[Dict[str, Any], str, None] = None, critical: bool = False) -> Dict[str, Any]:
+    # The breaker only gates new entries; everything else always goes out.
+    if not critical and bybit_opens_exposure(path, params):
+        bybit_breaker_check()
     attempts = max(1, BYBIT_RETRY_ATTEMPTS if BYBIT_RETRY_ENABLED else 1)
     last_exc = None
     for attempt in range(1, attempts + 1):
         try:
             resp = _V65_BASE_BYBIT(method, path, params)
+            bybit_breaker_record(True)
             ret_code = resp.get("retCode")
-            if ret_code in {10000, 10002, 10006, 10016} and attempt < attempts:
-                log(f"[WARN] Bybit transient retCode={ret_code}, retry {attempt}/{attempts}")
-                time.sleep(BYBIT_RETRY_SLEEP_SEC * attempt)
+            if ret_code in _BYBIT_TRANSIENT_CODES and attempt < attempts:
+                delay = bybit_retry_delay(attempt, ret_code in _BYBIT_RATE_LIMIT_CODES)
+                log(f"[WARN] Bybit transient retCode={ret_code}, retry {attempt}/{attempts} in {delay:.3f}s")
+                time.sleep(delay)
                 continue
             return resp
         except HTTPException as exc:
             last_exc = exc
             if attempt >= attempts or exc.status_code not in {408, 409, 425, 429, 500, 502, 503, 504}:
-                raise
-            log(f"[WARN] Bybit HTTPException retry {attempt}/{attempts}: {exc.detail}")
-            time.sleep(BYBIT_RETRY_SLEEP_SEC * attempt)
+                break
+            delay = bybit_retry_delay(attempt, exc.status_code == 429)
+            log(f"[WARN] Bybit HTTPException retry {attempt}/{attempts} in {delay:.3f}s: {exc.detail}")
+            time.sleep(delay)
         except Exception as exc:
             last_exc = exc
             if attempt >= attempts:
-                raise
-            log(f"[WARN] Bybit exception retry {attempt}/{attempts}: {exc}")
-            time.sleep(BYBIT_RETRY_SLEEP_SEC * attempt)
+                break
+            delay = bybit_retry_delay(attempt)
+            log(f"[WARN] Bybit exception retry {attempt}/{attempts} in {delay:.3f}s: {exc}")
+            time.sleep(delay)
+    # One failed call (all retries spent) counts once toward the breaker, and only
+    # for transport errors and 5xx; 4xx rejections say nothing about Bybit health.
+    if last_exc is not None and not (isinstance(last_exc, HTTPException) and last_exc.status_code < 500):
+        bybit_breaker_record(False)
     if last_exc:
         raise last_exc
     raise RuntimeError("Bybit request failed without exception")
@@ -7569,20 +8455,19 @@ def fetch_strategy_state_history(limit: int = 20) -> list[Dict[str, Any]]:
     resp = client.get(supabase_url_for_table(SUPABASE_STATE_HISTORY_TABLE), headers=supabase_headers(prefer=""), params=params)
     if resp.status_code >= 400:
         return []
-    rows = resp.json()
+    rows = orjson.loads(resp.content)
     return rows if isinstance(rows, list) else []
 
 
 @app.get("/strategy_state_history")
 def strategy_state_history(secret: str, limit: int = 20):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "history": fetch_strategy_state_history(limit=limit)}
 
 
 @app.post("/strategy_state_rollback")
-async def strategy_state_rollback(request: Request):
-    body = await request.json()
+def strategy_state_rollback(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     require_strategy_admin()
     version_id = str(body.get("version_id", ""))
@@ -7723,13 +8608,16 @@ def execute_bybit_trade(body: Dict[str, Any], risk_pct_used: float) -> Dict[str,
             symbol = normalize_symbol(body.get("symbol", ""))
             order_id = result.get("order_id", "")
             if ORDER_VERIFY_AFTER_ENTRY and order_id:
-                status = {}
-                for _ in range(max(1, ORDER_VERIFY_RETRIES)):
-                    time.sleep(ORDER_VERIFY_SLEEP_SEC)
+                # Probe right away, then back off up to ORDER_VERIFY_SLEEP_SEC; same total budget as before.
+                deadline = time.monotonic() + max(1, ORDER_VERIFY_RETRIES) * ORDER_VERIFY_SLEEP_SEC
+                delay = min(0.05, ORDER_VERIFY_SLEEP_SEC)
+                while True:
                     status = get_order_status(symbol=symbol, order_id=order_id)
                     rows = (status.get("result") or {}).get("list") or []
-                    if rows:
+                    if rows or time.monotonic() + delay > deadline:
                         break
+                    time.sleep(delay)
+                    delay = min(delay * 2, ORDER_VERIFY_SLEEP_SEC)
                 result["entry_order_status"] = status
             write_audit_event("execution_completed", {"exec_id": exec_id, "result": result}, status="order_sent")
             return result
@@ -7767,7 +8655,7 @@ def safer_auto_close_check(symbol: str) -> Dict[str, Any]:
 
 @app.post("/safe_auto_close_symbol")
 def safe_auto_close_symbol(secret: str, symbol: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     if not SAFE_AUTO_CLOSE_ENABLED:
         raise HTTPException(400, "SAFE_AUTO_CLOSE_ENABLED=false")
@@ -7846,7 +8734,7 @@ def handle_telegram_command_text_secure(text: str, chat_id: str) -> Dict[str, An
 
 @app.get("/telegram_security_status")
 def telegram_security_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "allowed_user_ids": TELEGRAM_ALLOWED_USER_IDS, "pending_confirms": len(_pending_telegram_confirms), "rate_limit_sec": TELEGRAM_COMMAND_RATE_LIMIT_SEC}
 
@@ -7883,8 +8771,7 @@ def evaluate_payload_without_order(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @app.post("/simulation_replay")
-async def simulation_replay(request: Request):
-    body = await request.json()
+def simulation_replay(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     payloads = body.get("payloads")
     if not isinstance(payloads, list):
@@ -7895,7 +8782,7 @@ async def simulation_replay(request: Request):
 
 @app.get("/simulation_replay_recent")
 def simulation_replay_recent(secret: str, days: int = 30, limit: int = 100):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     rows = fetch_supabase_logs_since(days=max(1, min(days, 90)), limit=max(1, min(limit, REPLAY_MAX_EVENTS))) if supabase_enabled() else []
     payloads = []
@@ -7953,7 +8840,6 @@ def last_signal_age_hours() -> Optional[float]:
             if row.get("strategy") not in {None, "SYSTEM", "SYSTEM_EMERGENCY"}:
                 ts = row.get("created_at") or row.get("timestamp_utc")
                 if ts:
-                    import datetime as _dt
                     dt = _dt.datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
                     return (time.time() - dt.timestamp()) / 3600.0
     except Exception:
@@ -7963,7 +8849,7 @@ def last_signal_age_hours() -> Optional[float]:
 
 @app.get("/production_health")
 def production_health(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     signal_age = last_signal_age_hours()
     stale = signal_age is not None and signal_age > SIGNAL_STALE_HOURS
@@ -7974,7 +8860,7 @@ def production_health(secret: str):
 
 @app.post("/production_health_notify")
 def production_health_notify(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     health = production_health(secret)
     if not health.get("ok") or health.get("signal_stale"):
@@ -8023,14 +8909,14 @@ def validate_runtime_config() -> Dict[str, Any]:
 
 @app.get("/config_validation")
 def config_validation(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return validate_runtime_config()
 
 
 @app.get("/config_validation_dashboard", response_class=HTMLResponse)
 def config_validation_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = validate_runtime_config()
     rows = []
@@ -8049,7 +8935,7 @@ def config_validation_dashboard(secret: str):
 
 @app.get("/control_panel", response_class=HTMLResponse)
 def control_panel(secret: str, days: int = 7):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     risk = summarize_open_risk()
     runtime = load_runtime_state()
@@ -8070,7 +8956,7 @@ def control_panel(secret: str, days: int = 7):
 
 @app.get("/supabase_physical_schema_sql")
 def supabase_physical_schema_sql(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     sql = """
 -- Optional v6.8.0 physical split tables. Run manually in Supabase SQL editor if needed.
@@ -8305,14 +9191,14 @@ def _apply_strategy_action(action: Dict[str, Any], reason_prefix: str = "promoti
 
 @app.get("/strategy_promotion_plan")
 def strategy_promotion_plan(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_strategy_promotion_plan(days=days, limit=limit)
 
 
 @app.get("/strategy_promotion_dashboard", response_class=HTMLResponse)
 def strategy_promotion_dashboard(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     plan = build_strategy_promotion_plan(days=days, limit=limit)
     rows = []
@@ -8335,8 +9221,7 @@ def strategy_promotion_dashboard(secret: str, days: int = PAPER_OUTCOME_DEFAULT_
 
 
 @app.post("/strategy_promotion_run")
-async def strategy_promotion_run(request: Request):
-    body = await request.json()
+def strategy_promotion_run(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     if not PROMOTION_MANAGER_ENABLED:
         raise HTTPException(403, "Promotion manager is disabled")
@@ -8445,7 +9330,7 @@ def build_ai_strategy_summary_text(items: list[Dict[str, Any]], risk: Dict[str,
 
 @app.get("/ai_strategy_analyst_report")
 def ai_strategy_analyst_report(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_ai_strategy_analyst_report(days=days, limit=limit)
 
@@ -8466,7 +9351,7 @@ def format_ai_strategy_analyst_message(report: Dict[str, Any]) -> str:
 
 @app.get("/telegram_ai_strategy_analyst_report")
 def telegram_ai_strategy_analyst_report(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS, force: bool = True):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_ai_strategy_analyst_report(days=days, limit=limit)
     message = format_ai_strategy_analyst_message(report)
@@ -8536,7 +9421,7 @@ def build_ai_risk_supervisor_report(days: int = PAPER_OUTCOME_DEFAULT_DAYS, limi
 
 @app.get("/ai_risk_supervisor")
 def ai_risk_supervisor(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_ai_risk_supervisor_report(days=days, limit=limit, include_plan=True)
 
@@ -8555,7 +9440,7 @@ def format_ai_risk_supervisor_message(report: Dict[str, Any]) -> str:
 
 @app.get("/telegram_ai_risk_supervisor")
 def telegram_ai_risk_supervisor(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_ai_risk_supervisor_report(days=days, limit=limit, include_plan=False)
     message = format_ai_risk_supervisor_message(report)
@@ -8592,8 +9477,7 @@ def parse_backtest_table_text(text: str, default_source: str = BACKTEST_IMPORT_D
 
 
 @app.post("/backtest_table_import")
-async def backtest_table_import(request: Request):
-    body = await request.json()
+def backtest_table_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     mode = str(body.get("mode", "upsert")).lower()
     rows = body.get("rows") or body.get("items")
@@ -8619,7 +9503,7 @@ async def backtest_table_import(request: Request):
 
 @app.get("/backtest_table_import_template")
 def backtest_table_import_template(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     csv_template = "strategy,symbol,side,timeframe,date_from,date_to,profit_factor,trades,win_rate,max_drawdown,net_profit,source\ntrend_continuation_avax_v11,AVAXUSDT,LONG,15,2026-01-01,2026-05-20,1.49,66,54.55,,,manual_tradingview"
     return {"ok": True, "csv_template": csv_template, "endpoint": "/backtest_table_import", "method": "POST", "body_example": {"secret": "...", "mode": "upsert", "csv_text": csv_template}}
@@ -8691,8 +9575,7 @@ def set_approval_decision(token: str, decision: str) -> Dict[str, Any]:
 
 
 @app.post("/approval_create")
-async def approval_create(request: Request):
-    body = await request.json()
+def approval_create(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     if not APPROVAL_WORKFLOW_ENABLED:
         raise HTTPException(403, "Approval workflow disabled")
@@ -8706,14 +9589,14 @@ async def approval_create(request: Request):
 
 @app.get("/approval_list")
 def approval_list(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "state": load_approval_state()}
 
 
 @app.get("/approval_decide")
 def approval_decide(secret: str, token: str, decision: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     result = set_approval_decision(token, decision)
     safe_notify_event("✅ Approval decision", f"token={token}\ndecision={decision}\nok={result.get('ok')}", important=True)
@@ -8721,8 +9604,7 @@ def approval_decide(secret: str, token: str, decision: str):
 
 
 @app.post("/approval_decide")
-async def approval_decide_post(request: Request):
-    body = await request.json()
+def approval_decide_post(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     result = set_approval_decision(str(body.get("token")), str(body.get("decision")))
     safe_notify_event("✅ Approval decision", f"token={body.get('token')}\ndecision={body.get('decision')}\nok={result.get('ok')}", important=True)
@@ -8730,8 +9612,7 @@ async def approval_decide_post(request: Request):
 
 
 @app.post("/promotion_approval_create")
-async def promotion_approval_create(request: Request):
-    body = await request.json()
+def promotion_approval_create(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     plan = build_strategy_promotion_plan(days=int(body.get("days", PAPER_OUTCOME_DEFAULT_DAYS)), limit=int(body.get("limit", PAPER_OUTCOME_MAX_EVENTS)))
     created = []
@@ -8781,14 +9662,14 @@ def build_portfolio_exposure_ai_summary(days: int = PAPER_OUTCOME_DEFAULT_DAYS,
 
 @app.get("/portfolio_exposure_ai_summary")
 def portfolio_exposure_ai_summary(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_portfolio_exposure_ai_summary(days=days, limit=limit)
 
 
 @app.get("/telegram_portfolio_exposure_ai_summary")
 def telegram_portfolio_exposure_ai_summary(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_portfolio_exposure_ai_summary(days=days, limit=limit)
     lines = ["📌 Portfolio Exposure AI Summary", report.get("summary", "")]
@@ -8800,7 +9681,7 @@ def telegram_portfolio_exposure_ai_summary(secret: str, days: int = PAPER_OUTCOM
 
 @app.get("/v7_control_center", response_class=HTMLResponse)
 def v7_control_center(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     risk = build_ai_risk_supervisor_report(days=days, limit=limit, include_plan=False)
     analyst = build_ai_strategy_analyst_report(days=days, limit=limit)
@@ -8828,14 +9709,13 @@ def v7_control_center(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit
 
 @app.get("/supabase_trade_log_health")
 def supabase_trade_log_health(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     base_url = str(SUPABASE_URL or "")
     safe_url = ""
     if base_url:
         try:
-            from urllib.parse import urlsplit
             parsed = urlsplit(base_url)
             safe_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme and parsed.netloc else base_url
         except Exception:
@@ -8857,9 +9737,9 @@ def supabase_trade_log_health(secret: str):
 
 @app.get("/version")
 def version(secret: Optional[str] = None):
-    if secret is not None and secret != SHARED_SECRET:
+    if secret is not None and not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
-    return {"ok": True, "version": APP_FEATURE_LEVEL, "base": "5.3.0", "features": ["order_hardening", "safe_auto_close", "telegram_command_security", "strategy_state_rollback", "audit_log", "simulation_replay", "portfolio_correlation_guard", "market_regime_filter", "production_monitoring", "config_validation", "control_panel", "paper_trade_outcome_tracker", "paper_outcome_decision_layer", "candidate_monitor", "paper_backtest_alignment", "backtest_manual_import", "backtest_registry", "cron_paper_outcome_report", "telegram_candidate_monitor_report", "paper_strategy_guard", "paper_auto_reject_warning", "strategy_promotion_manager", "ai_strategy_analyst", "ai_risk_supervisor", "backtest_table_import", "telegram_approval_workflow", "portfolio_exposure_ai_summary", "v7_control_center", "bybit_universe_scanner", "multi_symbol_strategy_scanner", "python_mini_backtest_engine", "auto_paper_candidate_onboarding_plan", "ai_market_opportunity_analyst", "discovery_candidate_plan", "near_miss_analysis", "discovery_validation_registry", "discovery_quality_calibration", "discovery_ranking_quality_fix", "v9_multi_market_research_framework", "crypto_higher_timeframe_research", "external_market_backtest_registry", "market_regime_gate", "combined_research_dashboard", "external_market_yahoo_fallback", "external_market_data_diagnostics", "persistent_supabase_registry", "universal_strategy_instance_layer", "promotion_history_registry", "early_warning_rules", "registry_bootstrap", "market_regime_gate_helper_fix", "bear_regime_short_research", "directional_market_regime_classifier", "directional_execution_gate", "long_short_performance_dashboard", "short_candidate_onboarding_plan", "tv_validation_registry", "validation_aware_short_calibration", "calibrated_short_research_dashboard", "deduplicated_short_portfolio_proposal", "micro_pilot_watchdog", "bull_regime_long_expansion_scanner", "wld_micro_pilot_guardrails", "telegram_watchdog_alerts", "long_candidate_onboarding_plan", "watchdog_market_gate_call_fix", "bull_long_scanner_function_name_fix", "supabase_keepalive", "data_source_guard", "raw_trade_event_inspector", "supabase_pause_watchdog", "outcome_source_trust_badge", "persistent_strategy_state_guard", "safe_baseline_enforcement", "micro_whitelist_guard", "deploy_drift_detector", "safe_baseline_python_literal_fix", "productive_micro_probe_lane", "direction_aligned_short_micro_probe", "xrp_short_micro_probe_baseline", "activity_pressure_layer", "micro_probe_performance_monitor", "execution_funnel_monitor", "probe_decision_report", "monitoring_only_release", "settings_readiness_dashboard", "telegram_duplicate_suppression", "tradingview_alert_checklist", "probe_setup_audit", "fast_batch_strategy_side_update", "fast_productive_baseline_apply", "batch_update_no_timeout"]}
+    return {"ok": True, "version": APP_FEATURE_LEVEL, "base": "5.3.0", "openssl": ssl.OPENSSL_VERSION, "hmac_openssl": HMAC_OPENSSL_BACKED, "features": ["order_hardening", "safe_auto_close", "telegram_command_security", "strategy_state_rollback", "audit_log", "simulation_replay", "portfolio_correlation_guard", "market_regime_filter", "production_monitoring", "config_validation", "control_panel", "paper_trade_outcome_tracker", "paper_outcome_decision_layer", "candidate_monitor", "paper_backtest_alignment", "backtest_manual_import", "backtest_registry", "cron_paper_outcome_report", "telegram_candidate_monitor_report", "paper_strategy_guard", "paper_auto_reject_warning", "strategy_promotion_manager", "ai_strategy_analyst", "ai_risk_supervisor", "backtest_table_import", "telegram_approval_workflow", "portfolio_exposure_ai_summary", "v7_control_center", "bybit_universe_scanner", "multi_symbol_strategy_scanner", "python_mini_backtest_engine", "auto_paper_candidate_onboarding_plan", "ai_market_opportunity_analyst", "discovery_candidate_plan", "near_miss_analysis", "discovery_validation_registry", "discovery_quality_calibration", "discovery_ranking_quality_fix", "v9_multi_market_research_framework", "crypto_higher_timeframe_research", "external_market_backtest_registry", "market_regime_gate", "combined_research_dashboard", "external_market_yahoo_fallback", "external_market_data_diagnostics", "persistent_supabase_registry", "universal_strategy_instance_layer", "promotion_history_registry", "early_warning_rules", "registry_bootstrap", "market_regime_gate_helper_fix", "bear_regime_short_research", "directional_market_regime_classifier", "directional_execution_gate", "long_short_performance_dashboard", "short_candidate_onboarding_plan", "tv_validation_registry", "validation_aware_short_calibration", "calibrated_short_research_dashboard", "deduplicated_short_portfolio_proposal", "micro_pilot_watchdog", "bull_regime_long_expansion_scanner", "wld_micro_pilot_guardrails", "telegram_watchdog_alerts", "long_candidate_onboarding_plan", "watchdog_market_gate_call_fix", "bull_long_scanner_function_name_fix", "supabase_keepalive", "data_source_guard", "raw_trade_event_inspector", "supabase_pause_watchdog", "outcome_source_trust_badge", "persistent_strategy_state_guard", "safe_baseline_enforcement", "micro_whitelist_guard", "deploy_drift_detector", "safe_baseline_python_literal_fix", "productive_micro_probe_lane", "direction_aligned_short_micro_probe", "xrp_short_micro_probe_baseline", "activity_pressure_layer", "micro_probe_performance_monitor", "execution_funnel_monitor", "probe_decision_report", "monitoring_only_release", "settings_readiness_dashboard", "telegram_duplicate_suppression", "tradingview_alert_checklist", "probe_setup_audit", "fast_batch_strategy_side_update", "fast_productive_baseline_apply", "batch_update_no_timeout"]}
 
 
 # ============================================================
@@ -8945,12 +9825,12 @@ def v8_interval_to_ms(interval: str) -> int:
 
 def v8_public_bybit_get(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     # Public endpoints do not require signing; this reduces risk of signature/permission noise.
-    url = BYBIT_BASE + path
+    # Goes through bybit_public_client: shares the Bybit keep-alive/HTTP2 pool without sending the API key.
     try:
-        resp = client.get(url, params={k: v for k, v in (params or {}).items() if v is not None})
+        resp = bybit_public_client.get(path, params={k: v for k, v in (params or {}).items() if v is not None})
         if resp.status_code >= 400:
             return {"retCode": resp.status_code, "retMsg": resp.text, "result": {}}
-        return resp.json()
+        return orjson.loads(resp.content)
     except Exception as exc:
         return {"retCode": -1, "retMsg": str(exc), "result": {}}
 
@@ -8968,6 +9848,11 @@ def bybit_get_all_linear_instruments() -> Dict[str, Dict[str, Any]]:
             sym = str(item.get("symbol", "")).upper()
             if sym:
                 out[sym] = item
+                # Same payload get_instrument() would fetch; warm its cache for free.
+                try:
+                    cache_instrument(sym, item)
+                except (TypeError, ValueError):
+                    pass
         cursor = result.get("nextPageCursor")
         if not cursor:
             break
@@ -9551,14 +10436,14 @@ def build_ai_market_opportunity_analyst(max_symbols: int = MINI_BACKTEST_MAX_SYM
 
 @app.get("/bybit_universe")
 def bybit_universe(secret: str, force: bool = False, max_symbols: int = UNIVERSE_MAX_SYMBOLS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_bybit_universe(force=force, max_symbols=max_symbols)
 
 
 @app.get("/bybit_universe_dashboard", response_class=HTMLResponse)
 def bybit_universe_dashboard(secret: str, force: bool = False, max_symbols: int = UNIVERSE_MAX_SYMBOLS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_bybit_universe(force=force, max_symbols=max_symbols)
     rows = "".join([f"<tr><td>{h(x.get('symbol'))}</td><td>{fmt_num(x.get('last_price'))}</td><td>{fmt_num(x.get('turnover24h'))}</td><td>{fmt_num(x.get('spread_pct'))}</td><td>{fmt_num(x.get('liquidity_score'))}</td></tr>" for x in data.get("items", [])[:100]])
@@ -9571,14 +10456,14 @@ def bybit_universe_dashboard(secret: str, force: bool = False, max_symbols: int
 
 @app.get("/multi_symbol_strategy_scan")
 def multi_symbol_strategy_scan(secret: str, max_symbols: int = SCANNER_TOP_N, interval: str = SCANNER_DEFAULT_INTERVAL):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return run_multi_symbol_strategy_scan(max_symbols=max_symbols, interval=interval)
 
 
 @app.get("/multi_symbol_strategy_scan_dashboard", response_class=HTMLResponse)
 def multi_symbol_strategy_scan_dashboard(secret: str, max_symbols: int = SCANNER_TOP_N, interval: str = SCANNER_DEFAULT_INTERVAL):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = run_multi_symbol_strategy_scan(max_symbols=max_symbols, interval=interval)
     rows = "".join([f"<tr><td>{h(x.get('symbol'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('score'))}</td><td>{h(x.get('recommendation'))}</td><td>{'YES' if x.get('signal_now') else 'NO'}</td><td>{fmt_num(x.get('turnover24h'))}</td></tr>" for x in data.get("top", [])[:100]])
@@ -9591,14 +10476,14 @@ def multi_symbol_strategy_scan_dashboard(secret: str, max_symbols: int = SCANNER
 
 @app.get("/mini_backtest_run")
 def mini_backtest_run(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, kline_limit: int = MINI_BACKTEST_KLINE_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return run_python_mini_backtests(max_symbols=max_symbols, interval=interval, kline_limit=kline_limit)
 
 
 @app.get("/mini_backtest_dashboard", response_class=HTMLResponse)
 def mini_backtest_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = run_python_mini_backtests(max_symbols=max_symbols, interval=interval)
     rows = "".join([f"<tr><td>{h(x.get('symbol'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('profit_factor'))}</td><td>{x.get('trade_count')}</td><td>{fmt_num(x.get('win_rate'))}</td><td>{fmt_num(x.get('average_r'))}</td><td>{fmt_num(x.get('current_score'))}</td><td>{'YES' if x.get('candidate') else 'NO'}</td></tr>" for x in data.get("rows", [])[:100]])
@@ -9611,21 +10496,21 @@ def mini_backtest_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SY
 
 @app.get("/auto_paper_candidate_plan")
 def auto_paper_candidate_plan(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_auto_paper_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest)
 
 
 @app.get("/ai_market_opportunity_analyst")
 def ai_market_opportunity_analyst(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_ai_market_opportunity_analyst(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest)
 
 
 @app.get("/ai_market_opportunity_dashboard", response_class=HTMLResponse)
 def ai_market_opportunity_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_ai_market_opportunity_analyst(max_symbols=max_symbols, interval=interval, force_backtest=False)
     rows = "".join([f"<tr><td>{h(x.get('symbol'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('profit_factor'))}</td><td>{x.get('trade_count')}</td><td>{fmt_num(x.get('current_score'))}</td><td>{h(x.get('action'))}</td></tr>" for x in data.get("top_candidates", [])[:50]])
@@ -9638,7 +10523,7 @@ def ai_market_opportunity_dashboard(secret: str, max_symbols: int = MINI_BACKTES
 
 @app.get("/telegram_market_opportunity_report")
 def telegram_market_opportunity_report(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_ai_market_opportunity_analyst(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest)
     lines = ["🧠 Market Opportunity Analyst", data.get("summary", "")]
@@ -9807,14 +10692,14 @@ def build_discovery_candidate_plan(max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS,
 
 @app.get("/discovery_candidate_plan")
 def discovery_candidate_plan(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False, include_rejected: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return build_discovery_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest, include_rejected=include_rejected)
 
 
 @app.get("/discovery_candidate_dashboard", response_class=HTMLResponse)
 def discovery_candidate_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False, include_rejected: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_discovery_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest, include_rejected=include_rejected)
     rows = "".join([
@@ -9832,7 +10717,7 @@ def discovery_candidate_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_
 
 @app.get("/telegram_discovery_candidate_report")
 def telegram_discovery_candidate_report(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_discovery_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest, include_rejected=False)
     bc = data.get("summary", {}).get("bucket_counts", {})
@@ -10097,8 +10982,7 @@ def build_discovery_candidate_plan(max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS,
 
 
 @app.post("/discovery_validation_import")
-async def discovery_validation_import(request: Request):
-    body = await request.json()
+def discovery_validation_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     mode = str(body.get("mode", "upsert")).lower()
     items = body.get("items") or body.get("rows") or []
@@ -10116,8 +11000,7 @@ async def discovery_validation_import(request: Request):
 
 
 @app.post("/discovery_validation_seed_recent")
-async def discovery_validation_seed_recent(request: Request):
-    body = await request.json()
+def discovery_validation_seed_recent(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows = [
         {"symbol": "NEARUSDT", "family": "trend_continuation", "side": "LONG", "interval": "15", "tv_pf": 1.085, "tv_trades": 132, "tv_win_rate": 47.73, "decision": "TV_REJECTED", "reason": "Manual TradingView validation 2026-01-01 to 2026-05-25: PF below 1.20"},
@@ -10133,15 +11016,14 @@ async def discovery_validation_seed_recent(request: Request):
 
 @app.get("/discovery_validation_registry")
 def discovery_validation_registry(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = load_discovery_validations()
     return {"ok": True, "version": APP_FEATURE_LEVEL, "count": len(data.get("rows", [])), "rows": data.get("rows", [])}
 
 
 @app.post("/discovery_validation_clear")
-async def discovery_validation_clear(request: Request):
-    body = await request.json()
+def discovery_validation_clear(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     write_json_file(DISCOVERY_VALIDATION_REGISTRY_FILE, {"rows": [], "updated_at": now_iso()})
     return {"ok": True, "cleared": True}
@@ -10149,7 +11031,7 @@ async def discovery_validation_clear(request: Request):
 
 @app.get("/discovery_top_candidates")
 def discovery_top_candidates(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False, include_rejected: bool = False, min_quality: str = "GOOD"):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_discovery_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest, include_rejected=include_rejected)
     allowed_by_min = {
@@ -10168,7 +11050,7 @@ def discovery_top_candidates(secret: str, max_symbols: int = MINI_BACKTEST_MAX_S
 
 @app.get("/discovery_quality_dashboard", response_class=HTMLResponse)
 def discovery_quality_dashboard(secret: str, max_symbols: int = MINI_BACKTEST_MAX_SYMBOLS, interval: str = SCANNER_DEFAULT_INTERVAL, force_backtest: bool = False, include_rejected: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = build_discovery_candidate_plan(max_symbols=max_symbols, interval=interval, force_backtest=force_backtest, include_rejected=include_rejected)
     rows = "".join([
@@ -10438,7 +11320,7 @@ def v9_fetch_yahoo_candles_diagnostics(ticker: str, interval: str = V9_EXTERNAL_
                 attempts.append(attempt)
                 continue
             try:
-                payload = resp.json()
+                payload = orjson.loads(resp.content)
             except Exception as exc:
                 attempt["error"] = f"JSON_DECODE_ERROR_{type(exc).__name__}"
                 attempt["body_preview"] = resp.text[:300]
@@ -10759,21 +11641,21 @@ def v9_market_regime_gate(days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = P
 
 @app.get("/v9_market_catalog")
 def v9_market_catalog_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_market_catalog()
 
 
 @app.get("/v9_crypto_higher_tf_research")
 def v9_crypto_higher_tf_research_endpoint(secret: str, max_symbols: int = V9_CRYPTO_HTF_MAX_SYMBOLS, intervals: str = V9_CRYPTO_HTF_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_crypto_higher_tf_research(max_symbols=max_symbols, intervals=intervals, force=force)
 
 
 @app.get("/v9_crypto_higher_tf_dashboard", response_class=HTMLResponse)
 def v9_crypto_higher_tf_dashboard(secret: str, max_symbols: int = V9_CRYPTO_HTF_MAX_SYMBOLS, intervals: str = V9_CRYPTO_HTF_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_crypto_higher_tf_research(max_symbols=max_symbols, intervals=intervals, force=force)
     rows = "".join([f"<tr><td>{h(x.get('research_label'))}</td><td>{h(x.get('symbol'))}</td><td>{h(x.get('timeframe'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('profit_factor'))}</td><td>{x.get('trade_count')}</td><td>{fmt_num(x.get('win_rate'))}</td><td>{fmt_num(x.get('average_r'))}</td><td>{fmt_num(x.get('current_score'))}</td><td>{fmt_num(x.get('rank_score'))}</td></tr>" for x in data.get("top", [])])
@@ -10786,21 +11668,21 @@ def v9_crypto_higher_tf_dashboard(secret: str, max_symbols: int = V9_CRYPTO_HTF_
 
 @app.get("/v9_external_data_diagnostics")
 def v9_external_data_diagnostics_endpoint(secret: str, ticker: str = "SPY", interval: str = V9_EXTERNAL_DEFAULT_INTERVAL, range: str = V9_EXTERNAL_DEFAULT_RANGE):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_fetch_yahoo_candles_diagnostics(ticker=ticker, interval=interval, range_=range)
 
 
 @app.get("/v9_external_market_research")
 def v9_external_market_research_endpoint(secret: str, market: str = "forex", tickers: Optional[str] = None, interval: str = V9_EXTERNAL_DEFAULT_INTERVAL, range: str = V9_EXTERNAL_DEFAULT_RANGE):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_external_market_research(market=market, tickers=tickers, interval=interval, range_=range)
 
 
 @app.get("/v9_external_market_dashboard", response_class=HTMLResponse)
 def v9_external_market_dashboard(secret: str, market: str = "forex", tickers: Optional[str] = None, interval: str = V9_EXTERNAL_DEFAULT_INTERVAL, range: str = V9_EXTERNAL_DEFAULT_RANGE):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_external_market_research(market=market, tickers=tickers, interval=interval, range_=range)
     rows = "".join([f"<tr><td>{h(x.get('research_label') or x.get('reason'))}</td><td>{h(x.get('symbol'))}</td><td>{h(x.get('timeframe'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('profit_factor'))}</td><td>{x.get('trade_count') or ''}</td><td>{fmt_num(x.get('win_rate'))}</td><td>{fmt_num(x.get('average_r'))}</td><td>{fmt_num(x.get('rank_score'))}</td></tr>" for x in data.get("rows", [])[:100]])
@@ -10812,8 +11694,7 @@ def v9_external_market_dashboard(secret: str, market: str = "forex", tickers: Op
 
 
 @app.post("/v9_external_backtest_import")
-async def v9_external_backtest_import(request: Request):
-    body = await request.json()
+def v9_external_backtest_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows_in = body.get("items") or body.get("rows") or []
     if not isinstance(rows_in, list):
@@ -10827,7 +11708,7 @@ async def v9_external_backtest_import(request: Request):
 
 @app.get("/v9_external_backtest_registry")
 def v9_external_backtest_registry(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_load_external_registry()
     return {"ok": True, "version": APP_FEATURE_LEVEL, "count": len(data.get("rows", [])), "rows": data.get("rows", []), "updated_at": data.get("updated_at")}
@@ -10835,14 +11716,14 @@ def v9_external_backtest_registry(secret: str):
 
 @app.get("/v9_market_regime_gate")
 def v9_market_regime_gate_endpoint(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_market_regime_gate(days=days, limit=limit)
 
 
 @app.get("/v9_market_regime_diagnostics")
 def v9_market_regime_diagnostics(secret: str, days: int = PAPER_OUTCOME_DEFAULT_DAYS, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     diagnostics: Dict[str, Any] = {
@@ -10881,7 +11762,7 @@ def v9_market_regime_diagnostics(secret: str, days: int = PAPER_OUTCOME_DEFAULT_
 
 @app.get("/v9_multi_market_research")
 def v9_multi_market_research(secret: str, max_symbols: int = 20, crypto_intervals: str = "60,240", external_interval: str = "60", external_range: str = V9_EXTERNAL_DEFAULT_RANGE, include_external: bool = True, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     crypto = v9_crypto_higher_tf_research(max_symbols=max_symbols, intervals=crypto_intervals, force=force)
     forex = v9_external_market_research(market="forex", interval=external_interval, range_=external_range) if include_external else {"rows": []}
@@ -10904,7 +11785,7 @@ def v9_multi_market_research(secret: str, max_symbols: int = 20, crypto_interval
 
 @app.get("/v9_multi_market_research_dashboard", response_class=HTMLResponse)
 def v9_multi_market_research_dashboard(secret: str, max_symbols: int = 20, crypto_intervals: str = "60,240", external_interval: str = "60", external_range: str = V9_EXTERNAL_DEFAULT_RANGE, include_external: bool = True, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_multi_market_research(secret=secret, max_symbols=max_symbols, crypto_intervals=crypto_intervals, external_interval=external_interval, external_range=external_range, include_external=include_external, force=force)
     rows = "".join([f"<tr><td>{h(x.get('market'))}</td><td>{h(x.get('research_label'))}</td><td>{h(x.get('symbol'))}</td><td>{h(x.get('timeframe') or x.get('interval'))}</td><td>{h(x.get('family'))}</td><td>{fmt_num(x.get('profit_factor'))}</td><td>{x.get('trade_count') or ''}</td><td>{fmt_num(x.get('win_rate'))}</td><td>{fmt_num(x.get('average_r'))}</td><td>{fmt_num(x.get('global_rank_score') or x.get('rank_score'))}</td><td>{'YES' if x.get('execution_supported') else 'NO'}</td></tr>" for x in data.get("top", [])])
@@ -10994,7 +11875,7 @@ def registry_cloud_fetch(registry_type: str) -> Optional[list[Dict[str, Any]]]:
         if response.status_code >= 300:
             _registry_cloud_fail(f"fetch:{registry_type}", f"HTTP_{response.status_code} {response.text[:240]}")
             return None
-        raw_rows = response.json()
+        raw_rows = orjson.loads(response.content)
         rows = []
         for raw in raw_rows if isinstance(raw_rows, list) else []:
             payload = raw.get("payload") if isinstance(raw, dict) else None
@@ -11044,7 +11925,7 @@ def registry_cloud_replace(registry_type: str, rows: list[Dict[str, Any]], key_f
                 registry_table_url(),
                 headers=headers,
                 params={"on_conflict": "registry_type,registry_key"},
-                json=records,
+                content=json_bytes(records),
                 timeout=REGISTRY_HTTP_TIMEOUT,
             )
             if upsert_response.status_code >= 300:
@@ -11066,7 +11947,7 @@ def registry_cloud_append(registry_type: str, row: Dict[str, Any], key: str) ->
             registry_table_url(),
             headers=supabase_headers(prefer="resolution=merge-duplicates,return=minimal"),
             params={"on_conflict": "registry_type,registry_key"},
-            json=record,
+            content=json_bytes(record),
             timeout=REGISTRY_HTTP_TIMEOUT,
         )
         if response.status_code >= 300:
@@ -11318,7 +12199,7 @@ def registry_backend_status() -> Dict[str, Any]:
 
 @app.get("/v9_1_registry_health")
 def v9_1_registry_health(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     probes = {}
     for registry_type in ["backtest", "discovery_validation", "strategy_instance", "promotion_history"]:
@@ -11331,8 +12212,7 @@ def v9_1_registry_health(secret: str):
 
 
 @app.post("/v9_1_registry_bootstrap")
-async def v9_1_registry_bootstrap(request: Request):
-    body = await request.json()
+def v9_1_registry_bootstrap(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     # Merge the known TradingView benchmarks, then persist them.
     bt_rows = merge_backtest_rows(load_backtest_results(), build_default_candidate_backtest_rows())
@@ -11363,7 +12243,7 @@ async def v9_1_registry_bootstrap(request: Request):
 
 @app.get("/strategy_instance_registry")
 def strategy_instance_registry(secret: str, include_off: bool = False, sync: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     if sync:
         rows = derive_strategy_instances_from_state(include_off=include_off)
@@ -11376,8 +12256,7 @@ def strategy_instance_registry(secret: str, include_off: bool = False, sync: boo
 
 
 @app.post("/strategy_instance_sync")
-async def strategy_instance_sync(request: Request):
-    body = await request.json()
+def strategy_instance_sync(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     rows = derive_strategy_instances_from_state(include_off=bool(body.get("include_off", False)))
     save_strategy_instances(rows)
@@ -11385,8 +12264,7 @@ async def strategy_instance_sync(request: Request):
 
 
 @app.post("/strategy_instance_import")
-async def strategy_instance_import(request: Request):
-    body = await request.json()
+def strategy_instance_import(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     incoming = body.get("rows") or body.get("items") or []
     if not isinstance(incoming, list):
@@ -11414,7 +12292,7 @@ async def strategy_instance_import(request: Request):
 
 @app.get("/strategy_instance_dashboard", response_class=HTMLResponse)
 def strategy_instance_dashboard(secret: str, sync: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     rows = derive_strategy_instances_from_state(include_off=False) if sync else load_strategy_instances()
     if sync:
@@ -11433,15 +12311,14 @@ def strategy_instance_dashboard(secret: str, sync: bool = False):
 
 @app.get("/promotion_history")
 def promotion_history(secret: str, limit: int = 200):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     rows = load_promotion_history(limit=max(1, min(limit, 2000)))
     return {"ok": True, "version": APP_FEATURE_LEVEL, "count": len(rows), "rows": rows}
 
 
 @app.post("/promotion_history_snapshot")
-async def promotion_history_snapshot(request: Request):
-    body = await request.json()
+def promotion_history_snapshot(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     days = int(body.get("days", 14))
     limit = int(body.get("limit", 500))
@@ -11452,7 +12329,7 @@ async def promotion_history_snapshot(request: Request):
 
 @app.get("/early_warning_report")
 def early_warning_report(secret: str, days: int = 14, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = build_paper_outcome_decision_report(days=days, limit=limit, include_outcomes=False)
     flagged = []
@@ -11476,7 +12353,7 @@ def early_warning_report(secret: str, days: int = 14, limit: int = 500):
 
 @app.get("/early_warning_dashboard", response_class=HTMLResponse)
 def early_warning_dashboard(secret: str, days: int = 14, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = early_warning_report(secret=secret, days=days, limit=limit)
     rows = "".join([
@@ -11493,7 +12370,7 @@ def early_warning_dashboard(secret: str, days: int = 14, limit: int = 500):
 
 @app.get("/persistent_registry_schema_sql", response_class=HTMLResponse)
 def persistent_registry_schema_sql(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     sql = """-- v9.1.0 generic persistent registry. Run once in Supabase SQL Editor.\ncreate table if not exists public.strategy_registry (\n  registry_type text not null,\n  registry_key text not null,\n  payload jsonb not null default '{}'::jsonb,\n  updated_at timestamptz not null default now(),\n  primary key (registry_type, registry_key)\n);\ncreate index if not exists strategy_registry_type_updated_idx\n  on public.strategy_registry (registry_type, updated_at desc);\nalter table public.strategy_registry enable row level security;\n-- The Render app uses SUPABASE_SERVICE_ROLE_KEY, which bypasses RLS.\n"""
     return HTMLResponse(f"<html><body><h1>Supabase persistent registry SQL</h1><pre>{h(sql)}</pre></body></html>")
@@ -12343,21 +13220,21 @@ def v9_2_directional_execution_gate(body: Dict[str, Any], mode: str) -> Dict[str
 
 @app.get("/v9_2_directional_market_regime")
 def v9_2_directional_market_regime_endpoint(secret: str, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_directional_market_regime(force=force)
 
 
 @app.get("/v9_2_crypto_short_research")
 def v9_2_crypto_short_research_endpoint(secret: str, max_symbols: int = V92_SHORT_MAX_SYMBOLS, intervals: str = V92_SHORT_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_crypto_short_research(max_symbols=max_symbols, intervals=intervals, force=force)
 
 
 @app.get("/v9_2_crypto_short_research_dashboard", response_class=HTMLResponse)
 def v9_2_crypto_short_research_dashboard(secret: str, max_symbols: int = V92_SHORT_MAX_SYMBOLS, intervals: str = V92_SHORT_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_2_crypto_short_research(max_symbols=max_symbols, intervals=intervals, force=force)
@@ -12418,21 +13295,21 @@ def v9_2_crypto_short_research_dashboard(secret: str, max_symbols: int = V92_SHO
 
 @app.get("/v9_2_short_candidate_onboarding_plan")
 def v9_2_short_candidate_onboarding_plan_endpoint(secret: str, max_symbols: int = V92_SHORT_MAX_SYMBOLS, intervals: str = V92_SHORT_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_short_candidate_onboarding_plan(max_symbols=max_symbols, intervals=intervals, force=force)
 
 
 @app.get("/v9_2_directional_performance")
 def v9_2_directional_performance_endpoint(secret: str, days: int = 30, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_directional_performance(days=days, limit=limit)
 
 
 @app.get("/v9_2_directional_performance_dashboard", response_class=HTMLResponse)
 def v9_2_directional_performance_dashboard(secret: str, days: int = 30, limit: int = PAPER_OUTCOME_MAX_EVENTS):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_2_directional_performance(days=days, limit=limit)
@@ -12471,14 +13348,14 @@ def v9_2_directional_performance_dashboard(secret: str, days: int = 30, limit: i
 
 @app.get("/v9_2_directional_execution_gate")
 def v9_2_directional_execution_gate_endpoint(secret: str, side: str = "LONG", mode: str = "MICRO"):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_directional_execution_gate(body={"side": side}, mode=mode)
 
 
 @app.get("/v9_2_control_panel", response_class=HTMLResponse)
 def v9_2_control_panel(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     regime = v9_2_directional_market_regime(force=False)
@@ -13027,7 +13904,7 @@ def v9_2_1_short_portfolio_proposal(
 
 @app.get("/v9_2_1_tv_validation_registry")
 def v9_2_1_tv_validation_registry_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     registry = v9_2_1_load_tv_validation_registry()
     if not registry.get("rows"):
@@ -13037,14 +13914,14 @@ def v9_2_1_tv_validation_registry_endpoint(secret: str):
 
 @app.post("/v9_2_1_seed_tv_validations")
 def v9_2_1_seed_tv_validations_endpoint(body: Dict[str, Any]):
-    if body.get("secret") != SHARED_SECRET:
+    if not secret_matches(body.get("secret")):
         raise HTTPException(401, "Unauthorized")
     return v9_2_1_seed_tv_validations(overwrite=bool(body.get("overwrite", False)))
 
 
 @app.post("/v9_2_1_tv_validation_import")
 def v9_2_1_tv_validation_import_endpoint(body: Dict[str, Any]):
-    if body.get("secret") != SHARED_SECRET:
+    if not secret_matches(body.get("secret")):
         raise HTTPException(401, "Unauthorized")
     rows = body.get("rows") or []
     if not isinstance(rows, list):
@@ -13059,7 +13936,7 @@ def v9_2_1_calibrated_short_research_endpoint(
     intervals: str = V92_SHORT_INTERVALS,
     force: bool = False,
 ):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_1_calibrated_short_research(max_symbols=max_symbols, intervals=intervals, force=force)
 
@@ -13071,7 +13948,7 @@ def v9_2_1_short_portfolio_proposal_endpoint(
     intervals: str = V92_SHORT_INTERVALS,
     force: bool = False,
 ):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_2_1_short_portfolio_proposal(max_symbols=max_symbols, intervals=intervals, force=force)
 
@@ -13083,7 +13960,7 @@ def v9_2_1_calibrated_short_dashboard(
     intervals: str = V92_SHORT_INTERVALS,
     force: bool = False,
 ):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_2_1_calibrated_short_research(max_symbols=max_symbols, intervals=intervals, force=force)
@@ -13583,14 +14460,14 @@ def v9_3_0_crypto_long_research(max_symbols: int = V930_LONG_MAX_SYMBOLS, interv
 
 @app.get("/v9_3_0_micro_pilot_watchdog")
 def v9_3_0_micro_pilot_watchdog_endpoint(secret: str, days: int = V930_WATCHDOG_LOOKBACK_DAYS, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_0_micro_pilot_watchdog(days=days, notify=notify)
 
 
 @app.get("/v9_3_0_micro_pilot_watchdog_dashboard", response_class=HTMLResponse)
 def v9_3_0_micro_pilot_watchdog_dashboard(secret: str, days: int = V930_WATCHDOG_LOOKBACK_DAYS, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_3_0_micro_pilot_watchdog(days=days, notify=notify)
     micro = data.get("micro_pilot") or {}
@@ -13666,14 +14543,14 @@ def v9_3_0_micro_pilot_watchdog_dashboard(secret: str, days: int = V930_WATCHDOG
 
 @app.get("/v9_3_0_bull_long_research")
 def v9_3_0_bull_long_research_endpoint(secret: str, max_symbols: int = V930_LONG_MAX_SYMBOLS, intervals: str = V930_LONG_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_0_crypto_long_research(max_symbols=max_symbols, intervals=intervals, force=force)
 
 
 @app.get("/v9_3_0_bull_long_onboarding_plan")
 def v9_3_0_bull_long_onboarding_plan_endpoint(secret: str, max_symbols: int = V930_LONG_MAX_SYMBOLS, intervals: str = V930_LONG_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     data = v9_3_0_crypto_long_research(max_symbols=max_symbols, intervals=intervals, force=force)
     return {
@@ -13688,7 +14565,7 @@ def v9_3_0_bull_long_onboarding_plan_endpoint(secret: str, max_symbols: int = V9
 
 @app.get("/v9_3_0_bull_long_research_dashboard", response_class=HTMLResponse)
 def v9_3_0_bull_long_research_dashboard(secret: str, max_symbols: int = V930_LONG_MAX_SYMBOLS, intervals: str = V930_LONG_INTERVALS, force: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_3_0_crypto_long_research(max_symbols=max_symbols, intervals=intervals, force=force)
@@ -13757,7 +14634,7 @@ def v9_3_0_bull_long_research_dashboard(secret: str, max_symbols: int = V930_LON
 
 @app.get("/v9_3_0_control_panel", response_class=HTMLResponse)
 def v9_3_0_control_panel(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     watchdog = v9_3_0_micro_pilot_watchdog(days=V930_WATCHDOG_LOOKBACK_DAYS, notify=False)
@@ -13821,7 +14698,6 @@ def v9_3_2_safe_supabase_url() -> str:
     if not base_url:
         return ""
     try:
-        from urllib.parse import urlsplit
         parsed = urlsplit(base_url)
         return f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme and parsed.netloc else base_url
     except Exception:
@@ -13832,7 +14708,6 @@ def v9_3_2_parse_iso_ts(value: Any) -> Optional[float]:
     if not value:
         return None
     try:
-        import datetime as _dt
         cleaned = str(value).replace("Z", "+00:00")
         parsed = _dt.datetime.fromisoformat(cleaned)
         if parsed.tzinfo is None:
@@ -13883,7 +14758,7 @@ def v9_3_2_supabase_direct_probe(limit: int = 1) -> Dict[str, Any]:
                 "table": SUPABASE_TABLE,
             }
 
-        rows = resp.json()
+        rows = orjson.loads(resp.content)
         if not isinstance(rows, list):
             return {
                 "ok": False,
@@ -14079,35 +14954,35 @@ def v9_3_2_raw_trade_events(days: int = 30, limit: int = 50, source: str = "auto
 
 @app.get("/supabase_keepalive")
 def supabase_keepalive_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_2_supabase_keepalive(notify=notify)
 
 
 @app.get("/v9_3_2_supabase_keepalive")
 def v9_3_2_supabase_keepalive_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_2_supabase_keepalive(notify=notify)
 
 
 @app.get("/v9_3_2_data_source_guard")
 def v9_3_2_data_source_guard_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_2_data_source_guard(notify=notify)
 
 
 @app.get("/v9_3_2_raw_trade_events")
 def v9_3_2_raw_trade_events_endpoint(secret: str, days: int = 30, limit: int = 50, source: str = "auto"):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_2_raw_trade_events(days=days, limit=limit, source=source)
 
 
 @app.get("/v9_3_2_outcome_source_status")
 def v9_3_2_outcome_source_status_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     guard = v9_3_2_data_source_guard(notify=False)
     return {
@@ -14123,7 +14998,7 @@ def v9_3_2_outcome_source_status_endpoint(secret: str):
 
 @app.get("/v9_3_2_data_source_dashboard", response_class=HTMLResponse)
 def v9_3_2_data_source_dashboard(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     guard = v9_3_2_data_source_guard(notify=notify)
@@ -14194,7 +15069,7 @@ def v9_3_2_data_source_dashboard(secret: str, notify: bool = False):
 
 @app.get("/v9_3_2_control_panel", response_class=HTMLResponse)
 def v9_3_2_control_panel(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data_guard = v9_3_2_data_source_guard(notify=False)
@@ -14529,14 +15404,13 @@ def v9_3_3_enforce_safe_baseline(reason: str = "v9_3_3_safe_baseline_enforce") -
 
 @app.get("/v9_3_3_strategy_state_guard")
 def v9_3_3_strategy_state_guard_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_3_strategy_state_guard(notify=notify)
 
 
 @app.post("/v9_3_3_enforce_safe_baseline")
-async def v9_3_3_enforce_safe_baseline_endpoint(request: Request):
-    body = await request.json()
+def v9_3_3_enforce_safe_baseline_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "ENFORCE_SAFE_BASELINE":
@@ -14546,14 +15420,14 @@ async def v9_3_3_enforce_safe_baseline_endpoint(request: Request):
 
 @app.get("/v9_3_3_safe_baseline")
 def v9_3_3_safe_baseline_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "version": APP_FEATURE_LEVEL, "state": V933_SAFE_BASELINE_STATE}
 
 
 @app.get("/v9_3_3_strategy_state_guard_dashboard", response_class=HTMLResponse)
 def v9_3_3_strategy_state_guard_dashboard(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_3_3_strategy_state_guard(notify=notify)
@@ -14629,7 +15503,7 @@ def v9_3_3_strategy_state_guard_dashboard(secret: str, notify: bool = False):
 
 @app.get("/v9_3_3_control_panel", response_class=HTMLResponse)
 def v9_3_3_control_panel(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     source_guard = v9_3_2_data_source_guard(notify=False)
@@ -14967,14 +15841,13 @@ def v9_3_5_disable_default_micro_probe(reason: str = "v9_3_5_disable_default_mic
 
 @app.get("/v9_3_5_productive_risk_status")
 def v9_3_5_productive_risk_status_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_5_probe_candidate_status()
 
 
 @app.post("/v9_3_5_enable_micro_probe")
-async def v9_3_5_enable_micro_probe_endpoint(request: Request):
-    body = await request.json()
+def v9_3_5_enable_micro_probe_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "ENABLE_MICRO_PROBE":
@@ -14983,8 +15856,7 @@ async def v9_3_5_enable_micro_probe_endpoint(request: Request):
 
 
 @app.post("/v9_3_5_disable_micro_probe")
-async def v9_3_5_disable_micro_probe_endpoint(request: Request):
-    body = await request.json()
+def v9_3_5_disable_micro_probe_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "DISABLE_MICRO_PROBE":
@@ -14994,7 +15866,7 @@ async def v9_3_5_disable_micro_probe_endpoint(request: Request):
 
 @app.get("/v9_3_5_productive_risk_dashboard", response_class=HTMLResponse)
 def v9_3_5_productive_risk_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_3_5_probe_candidate_status()
@@ -15063,7 +15935,7 @@ def v9_3_5_productive_risk_dashboard(secret: str):
 
 @app.get("/v9_3_5_control_panel", response_class=HTMLResponse)
 def v9_3_5_control_panel(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     productive = v9_3_5_probe_candidate_status()
@@ -15461,35 +16333,35 @@ def v9_3_6_probe_decision_report(days: int = 30, limit: int = 500, key: str = V9
 
 @app.get("/v9_3_6_micro_probe_events")
 def v9_3_6_micro_probe_events_endpoint(secret: str, days: int = 30, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_6_micro_probe_events(days=days, limit=limit)
 
 
 @app.get("/v9_3_6_execution_funnel")
 def v9_3_6_execution_funnel_endpoint(secret: str, days: int = 30, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_6_execution_funnel(days=days, limit=limit)
 
 
 @app.get("/v9_3_6_micro_probe_performance")
 def v9_3_6_micro_probe_performance_endpoint(secret: str, days: int = 30, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_6_probe_performance(days=days, limit=limit)
 
 
 @app.get("/v9_3_6_probe_decision_report")
 def v9_3_6_probe_decision_report_endpoint(secret: str, days: int = 30, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_6_probe_decision_report(days=days, limit=limit)
 
 
 @app.get("/v9_3_6_micro_probe_dashboard", response_class=HTMLResponse)
 def v9_3_6_micro_probe_dashboard(secret: str, days: int = 30, limit: int = 500):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     report = v9_3_6_probe_decision_report(days=days, limit=limit)
@@ -15868,14 +16740,14 @@ def v9_3_7_probe_setup_audit(notify: bool = False) -> Dict[str, Any]:
 
 @app.get("/v9_3_7_probe_setup_audit")
 def v9_3_7_probe_setup_audit_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_7_probe_setup_audit(notify=notify)
 
 
 @app.get("/v9_3_7_readiness_dashboard", response_class=HTMLResponse)
 def v9_3_7_readiness_dashboard(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     audit = v9_3_7_probe_setup_audit(notify=notify)
@@ -15962,8 +16834,7 @@ def v9_3_7_readiness_dashboard(secret: str, notify: bool = False):
 
 
 @app.post("/v9_3_7_tradingview_checklist")
-async def v9_3_7_tradingview_checklist_endpoint(request: Request):
-    body = await request.json()
+def v9_3_7_tradingview_checklist_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     items = body.get("items") if isinstance(body.get("items"), dict) else {}
     notes = body.get("notes")
@@ -15972,14 +16843,14 @@ async def v9_3_7_tradingview_checklist_endpoint(request: Request):
 
 @app.get("/v9_3_7_tradingview_checklist")
 def v9_3_7_tradingview_checklist_get(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {"ok": True, "version": APP_FEATURE_LEVEL, "checklist": v9_3_7_get_tradingview_checklist()}
 
 
 @app.get("/v9_3_7_telegram_noise_status")
 def v9_3_7_telegram_noise_status(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     state = read_json_file(V937_SETTINGS_AUDIT_STATE_FILE, {})
     return {
@@ -16083,8 +16954,7 @@ def v9_3_8_apply_side_updates(updates: list[Dict[str, Any]], dry_run: bool = Fal
 
 
 @app.post("/v9_3_8_batch_strategy_side_update")
-async def v9_3_8_batch_strategy_side_update_endpoint(request: Request):
-    body = await request.json()
+def v9_3_8_batch_strategy_side_update_endpoint(request: Request, body: Any = Depends(json_body)):
 
     if isinstance(body, list):
         raise HTTPException(400, "Body must be an object with secret and updates. Use {'secret':'...', 'updates':[...]}, not a raw list.")
@@ -16098,8 +16968,7 @@ async def v9_3_8_batch_strategy_side_update_endpoint(request: Request):
 
 
 @app.post("/v9_3_8_apply_productive_baseline")
-async def v9_3_8_apply_productive_baseline_endpoint(request: Request):
-    body = await request.json()
+def v9_3_8_apply_productive_baseline_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
 
     confirm = str(body.get("confirm") or "").upper()
@@ -16115,7 +16984,7 @@ async def v9_3_8_apply_productive_baseline_endpoint(request: Request):
 
 @app.get("/v9_3_8_productive_baseline_preview")
 def v9_3_8_productive_baseline_preview_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -16128,7 +16997,7 @@ def v9_3_8_productive_baseline_preview_endpoint(secret: str):
 
 @app.get("/v9_3_8_batch_update_dashboard", response_class=HTMLResponse)
 def v9_3_8_batch_update_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     preview = {"count": len(V938_PRODUCTIVE_BASELINE_UPDATES), "updates": V938_PRODUCTIVE_BASELINE_UPDATES}
@@ -16172,7 +17041,7 @@ def v9_3_8_batch_update_dashboard(secret: str):
 
 @app.get("/v9_3_9_startup_health")
 def v9_3_9_startup_health(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     marker = read_json_file(APP_DIR / "v9_3_9_startup_marker.json", {})
     return {
@@ -16476,21 +17345,20 @@ def v9_4_0_pause_short_probe(reason: str = "v9_4_0_pause_short_probe") -> Dict[s
 
 @app.get("/v9_4_0_regime_probe_controller")
 def v9_4_0_regime_probe_controller_endpoint(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_0_regime_probe_controller(notify=notify)
 
 
 @app.get("/v9_4_0_long_probe_candidates")
 def v9_4_0_long_probe_candidates_endpoint(secret: str, max_items: int = 10):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_0_long_probe_candidates(max_items=max_items)
 
 
 @app.post("/v9_4_0_pause_short_probe")
-async def v9_4_0_pause_short_probe_endpoint(request: Request):
-    body = await request.json()
+def v9_4_0_pause_short_probe_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "PAUSE_SHORT_PROBE":
@@ -16500,7 +17368,7 @@ async def v9_4_0_pause_short_probe_endpoint(request: Request):
 
 @app.get("/v9_4_0_regime_probe_dashboard", response_class=HTMLResponse)
 def v9_4_0_regime_probe_dashboard(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_4_0_regime_probe_controller(notify=notify)
@@ -16587,7 +17455,7 @@ def v9_4_0_regime_probe_dashboard(secret: str, notify: bool = False):
 
 @app.get("/v9_4_0_readiness_dashboard", response_class=HTMLResponse)
 def v9_4_0_readiness_dashboard(secret: str, notify: bool = False):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_3_7_readiness_dashboard(secret=secret, notify=notify)
 
@@ -16607,7 +17475,7 @@ V941_PAUSED_BASELINE_UPDATES = [{'strategy': 'structure_swing_v134', 'symbol': '
 
 @app.get("/v9_4_1_paused_baseline_preview")
 def v9_4_1_paused_baseline_preview(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -16624,8 +17492,7 @@ def v9_4_1_paused_baseline_preview(secret: str):
 
 
 @app.post("/v9_4_1_apply_paused_baseline")
-async def v9_4_1_apply_paused_baseline(request: Request):
-    body = await request.json()
+def v9_4_1_apply_paused_baseline(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "APPLY_PAUSED_BASELINE":
@@ -16640,7 +17507,7 @@ async def v9_4_1_apply_paused_baseline(request: Request):
 
 @app.get("/v9_4_1_readiness_dashboard", response_class=HTMLResponse)
 def v9_4_1_readiness_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     source_guard = v9_3_2_data_source_guard(notify=False)
@@ -16938,14 +17805,14 @@ def v9_4_2_active_performance_report(days_long: int = V942_DAYS_LONG, days_short
 
 @app.get("/v9_4_2_active_performance_report")
 def v9_4_2_active_performance_report_endpoint(secret: str, days_long: int = V942_DAYS_LONG, days_short: int = V942_DAYS_SHORT, limit: int = V942_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_2_active_performance_report(days_long=days_long, days_short=days_short, limit=limit)
 
 
 @app.get("/v9_4_2_active_performance_dashboard", response_class=HTMLResponse)
 def v9_4_2_active_performance_dashboard(secret: str, days_long: int = V942_DAYS_LONG, days_short: int = V942_DAYS_SHORT, limit: int = V942_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     report = v9_4_2_active_performance_report(days_long=days_long, days_short=days_short, limit=limit)
@@ -17010,7 +17877,7 @@ def v9_4_2_active_performance_dashboard(secret: str, days_long: int = V942_DAYS_
 
 @app.get("/v9_4_3_hotfix_note")
 def v9_4_3_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17270,14 +18137,14 @@ def v9_4_4_outcome_active_performance_report(days_long: int = V944_DAYS_LONG, da
 
 @app.get("/v9_4_4_outcome_active_performance_report")
 def v9_4_4_outcome_active_performance_report_endpoint(secret: str, days_long: int = V944_DAYS_LONG, days_short: int = V944_DAYS_SHORT, limit: int = V944_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_4_outcome_active_performance_report(days_long=days_long, days_short=days_short, limit=limit)
 
 
 @app.get("/v9_4_4_outcome_active_performance_dashboard", response_class=HTMLResponse)
 def v9_4_4_outcome_active_performance_dashboard(secret: str, days_long: int = V944_DAYS_LONG, days_short: int = V944_DAYS_SHORT, limit: int = V944_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     report = v9_4_4_outcome_active_performance_report(days_long=days_long, days_short=days_short, limit=limit)
 
@@ -17339,7 +18206,7 @@ def v9_4_4_outcome_active_performance_dashboard(secret: str, days_long: int = V9
 
 @app.get("/v9_4_4_hotfix_note")
 def v9_4_4_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17356,7 +18223,7 @@ def v9_4_4_hotfix_note(secret: str):
 
 @app.get("/v9_4_5_hotfix_note")
 def v9_4_5_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17411,14 +18278,13 @@ def v9_4_6_cleanup_preview() -> Dict[str, Any]:
 
 @app.get("/v9_4_6_cleanup_preview")
 def v9_4_6_cleanup_preview_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_6_cleanup_preview()
 
 
 @app.post("/v9_4_6_apply_cleanup")
-async def v9_4_6_apply_cleanup_endpoint(request: Request):
-    body = await request.json()
+def v9_4_6_apply_cleanup_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "APPLY_PAPER_CLEANUP":
@@ -17433,7 +18299,7 @@ async def v9_4_6_apply_cleanup_endpoint(request: Request):
 
 @app.get("/v9_4_6_cleanup_dashboard", response_class=HTMLResponse)
 def v9_4_6_cleanup_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     preview = v9_4_6_cleanup_preview()
@@ -17497,7 +18363,7 @@ def v9_4_6_cleanup_dashboard(secret: str):
 
 @app.get("/v9_4_6_expected_state")
 def v9_4_6_expected_state(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17755,14 +18621,14 @@ def v9_4_7_active_only_market_gate(days_long: int = V947_DAYS_LONG, days_short:
 
 @app.get("/v9_4_7_active_only_market_gate")
 def v9_4_7_active_only_market_gate_endpoint(secret: str, days_long: int = V947_DAYS_LONG, days_short: int = V947_DAYS_SHORT, limit: int = V947_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_7_active_only_market_gate(days_long=days_long, days_short=days_short, limit=limit)
 
 
 @app.get("/v9_4_7_active_only_market_gate_dashboard", response_class=HTMLResponse)
 def v9_4_7_active_only_market_gate_dashboard(secret: str, days_long: int = V947_DAYS_LONG, days_short: int = V947_DAYS_SHORT, limit: int = V947_LIMIT):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     data = v9_4_7_active_only_market_gate(days_long=days_long, days_short=days_short, limit=limit)
@@ -17844,7 +18710,7 @@ def v9_4_7_active_only_market_gate_dashboard(secret: str, days_long: int = V947_
 
 @app.get("/v9_4_7_hotfix_note")
 def v9_4_7_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17899,14 +18765,14 @@ def v9_4_8_clean_baseline_alignment_status() -> Dict[str, Any]:
 
 @app.get("/v9_4_8_clean_baseline_status")
 def v9_4_8_clean_baseline_status_endpoint(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return v9_4_8_clean_baseline_alignment_status()
 
 
 @app.get("/v9_4_8_clean_baseline_preview")
 def v9_4_8_clean_baseline_preview(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -17926,8 +18792,7 @@ def v9_4_8_clean_baseline_preview(secret: str):
 
 
 @app.post("/v9_4_8_apply_clean_baseline")
-async def v9_4_8_apply_clean_baseline_endpoint(request: Request):
-    body = await request.json()
+def v9_4_8_apply_clean_baseline_endpoint(request: Request, body: Any = Depends(json_body)):
     verify_secret(request, body)
     confirm = str(body.get("confirm") or "").upper()
     if confirm != "APPLY_CLEAN_BASELINE":
@@ -17942,7 +18807,7 @@ async def v9_4_8_apply_clean_baseline_endpoint(request: Request):
 
 @app.get("/v9_4_8_clean_baseline_dashboard", response_class=HTMLResponse)
 def v9_4_8_clean_baseline_dashboard(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
 
     errors = []
@@ -18067,7 +18932,7 @@ def v9_4_8_clean_baseline_dashboard(secret: str):
 
 @app.get("/v9_4_8_hotfix_note")
 def v9_4_8_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -18086,7 +18951,7 @@ def v9_4_8_hotfix_note(secret: str):
 
 @app.get("/v9_4_9_hotfix_note")
 def v9_4_9_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -18104,7 +18969,7 @@ def v9_4_9_hotfix_note(secret: str):
 
 @app.get("/v9_4_10_hotfix_note")
 def v9_4_10_hotfix_note(secret: str):
-    if secret != SHARED_SECRET:
+    if not secret_matches(secret):
         raise HTTPException(401, "Unauthorized")
     return {
         "ok": True,
@@ -18117,3 +18982,17 @@ def v9_4_10_hotfix_note(secret: str):
         "no_risk_change": True,
     }
 
+
+
+if __name__ == "__main__":
+    # Local runs mirror the Procfile: uvloop event loop, httptools parser, one worker.
+    import uvicorn
+
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )